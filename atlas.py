@@ -0,0 +1,217 @@
+import pygame
+import math
+from collections import namedtuple
+from entities import (Helicopter, Bullet, Obstacle, Turret, EnemyBullet, Coin, Medikit,
+                      health_bar_color, lerp)
+from display import SCREEN_WIDTH, SCREEN_HEIGHT
+
+ROTOR_STEP = 20
+ROTOR_FRAMES = 360 // ROTOR_STEP
+TURRET_ANGLE_BUCKETS = 72
+OBSTACLE_HEIGHTS = range(70, 181)
+HEALTH_BAR_WIDTH = 60
+# Mitad del sprite más ancho entre monedas y torretas (cañón incluido)
+TURRET_RADIUS = 32
+# Color transparente de los sprites simplificados (ninguna forma lo usa)
+COLORKEY = (255, 0, 255)
+# Sprites que tienen versión simplificada (ver SpriteAtlas.set_simple)
+SIMPLE_SPRITES = ("helicopter", "turrets", "bullet", "enemy_bullet", "coin", "medikit",
+                  "obstacles", "health_bars")
+
+
+def _prepare(surf):
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha()
+
+
+# Máscara de un sprite, su ancla y los bordes de sus píxeles opacos
+# relativos al ancla, para probar primero con enteros y recién después con
+# la máscara
+Collider = namedtuple("Collider", "mask ax ay left top right bottom")
+
+
+def _collider(sprite):
+    surf, (ax, ay) = sprite
+    mask = pygame.mask.from_surface(surf)
+    rects = mask.get_bounding_rects()
+    bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+    return Collider(mask, ax, ay, bounds.left - ax, bounds.top - ay, bounds.right - ax, bounds.bottom - ay)
+
+
+def _flatten(sprite):
+    """
+    Copia del sprite sin alfa por píxel: fondo COLORKEY con aceleración RLE.
+    Las formas son opacas (alfa 0 o 255), así que se ve igual y cada blit
+    cuesta varias veces menos.
+    """
+    surf, anchor = sprite
+    flat = pygame.Surface(surf.get_size())
+    flat.fill(COLORKEY)
+    flat.blit(surf, (0, 0))
+    if pygame.display.get_surface() is not None:
+        flat = flat.convert()
+    flat.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return flat, anchor
+
+
+def _flatten_all(sprites):
+    """_flatten de un sprite, una lista o un dict de sprites."""
+    if isinstance(sprites, list):
+        return [_flatten(sprite) for sprite in sprites]
+    if isinstance(sprites, dict):
+        return {key: _flatten(sprite) for key, sprite in sprites.items()}
+    return _flatten(sprites)
+
+
+def _render(size, anchor, draw, flat=False):
+    """Dibuja una forma en un lienzo transparente; anchor es el punto (x, y) de la entidad."""
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    draw(surf, *anchor)
+    if flat:
+        return _flatten((surf, anchor))
+    return _prepare(surf), anchor
+
+
+class SpriteAtlas:
+    """
+    Sprites pre-renderizados de todas las entidades:
+    - Helicóptero: un cuadro por paso del rotor (18).
+    - Torretas: cuerpo y cañón por sector de ángulo, más las marcas de vida.
+    - Obstáculos: uno por altura; monedas, balas y medikits: uno cada uno.
+    Cada sprite guarda su ancla, así dibujar una entidad es una sola blit y
+    todo el frame se arma como una lista para Surface.blits.
+    De los mismos sprites salen las máscaras de colisión (una por cuadro del
+    rotor para el helicóptero), así lo que choca es exactamente lo que se ve.
+    set_simple(True) cambia a sprites con colorkey y sin marcas de vida en
+    las torretas (lo decide el gobernador de calidad, ver quality.py).
+    """
+
+    def __init__(self):
+        self.simple = False
+        # simple -> {nombre: sprites} del juego de sprites que no está en uso
+        self._sprite_sets = {}
+        self.helicopter = [
+            _render((104, 50), (56, 26),
+                    lambda s, x, y, a=i * ROTOR_STEP: Helicopter.draw_shape(s, x, y, a))
+            for i in range(ROTOR_FRAMES)
+        ]
+        self.turrets = [
+            _render((64, 64), (32, 32),
+                    lambda s, x, y, a=i * 2 * math.pi / TURRET_ANGLE_BUCKETS: Turret.draw_shape(s, x, y, a))
+            for i in range(TURRET_ANGLE_BUCKETS)
+        ]
+        self.turret_pips = [
+            _render((32, 8), (16, 29), lambda s, x, y, h=h: Turret.draw_health_pips(s, x, y, h))
+            for h in range(4)
+        ]
+        self.bullet = _render((26, 26), (13, 13), lambda s, x, y: Bullet.draw_shape(s, x, y, 12))
+        self.enemy_bullet = _render((12, 12), (6, 6), lambda s, x, y: EnemyBullet.draw_shape(s, x, y, 5))
+        self.coin = _render((26, 26), (13, 13), lambda s, x, y: Coin.draw_shape(s, x, y, 12))
+        self.medikit = _render((42, 42), (21, 21), lambda s, x, y: Medikit.draw_shape(s, x, y, 20))
+        self.obstacles = {}
+        for height in OBSTACLE_HEIGHTS:
+            self.obstacle(height)
+        self.health_bars = {}
+
+        self.helicopter_masks = [_collider(sprite) for sprite in self.helicopter]
+        self.enemy_bullet_mask = _collider(self.enemy_bullet)
+        self.coin_mask = _collider(self.coin)
+        self.medikit_mask = _collider(self.medikit)
+        self.obstacle_masks = {}
+
+    # ---------------------------------------
+    # SPRITES CON VARIANTES
+    # ---------------------------------------
+    def obstacle(self, height, width=60):
+        sprite = self.obstacles.get((height, width))
+        if sprite is None:
+            sprite = _render((width, height), (0, 0),
+                             lambda s, x, y: Obstacle.draw_shape(s, x, y, width, height), self.simple)
+            self.obstacles[(height, width)] = sprite
+        return sprite
+
+    def obstacle_mask(self, size):
+        """Los obstáculos son rectángulos macizos: máscara llena por tamaño."""
+        mask = self.obstacle_masks.get(size)
+        if mask is None:
+            mask = self.obstacle_masks[size] = pygame.Mask(size, fill=True)
+        return mask
+
+    @staticmethod
+    def helicopter_frame(rotor_angle):
+        return (int(rotor_angle) // ROTOR_STEP) % ROTOR_FRAMES
+
+    def helicopter_collider(self, heli):
+        """(máscara, origen, rect de los píxeles opacos) del helicóptero en pantalla en el tick actual."""
+        c = self.helicopter_masks[self.helicopter_frame(heli.rotor_angle)]
+        x = int(heli.x)
+        y = int(heli.y)
+        return c.mask, (x - c.ax, y - c.ay), pygame.Rect(x + c.left, y + c.top, c.right - c.left, c.bottom - c.top)
+
+    def set_simple(self, simple):
+        """Cambia de juego de sprites; los simplificados se crean la primera vez que se piden."""
+        if simple == self.simple:
+            return
+        self._sprite_sets[self.simple] = {name: getattr(self, name) for name in SIMPLE_SPRITES}
+        sprites = self._sprite_sets.pop(simple, None)
+        if sprites is None:
+            sprites = {name: _flatten_all(getattr(self, name)) for name in SIMPLE_SPRITES}
+        for name, value in sprites.items():
+            setattr(self, name, value)
+        self.simple = simple
+
+    def turret(self, angle):
+        bucket = round(angle * TURRET_ANGLE_BUCKETS / (2 * math.pi)) % TURRET_ANGLE_BUCKETS
+        return self.turrets[bucket]
+
+    def health_bar(self, health, max_health):
+        key = (int((health / max_health) * HEALTH_BAR_WIDTH), health_bar_color(health))
+        sprite = self.health_bars.get(key)
+        if sprite is None:
+            sprite = _render((HEALTH_BAR_WIDTH, 6), (HEALTH_BAR_WIDTH // 2, 30),
+                             lambda s, x, y: Helicopter.draw_health_bar_shape(s, x, y, health, max_health),
+                             self.simple)
+            self.health_bars[key] = sprite
+        return sprite
+
+    # ---------------------------------------
+    # LISTAS DE BLITS
+    # ---------------------------------------
+    @staticmethod
+    def _place(blits, sprite, x, y):
+        surf, (ax, ay) = sprite
+        blits.append((surf, (int(x) - ax, int(y) - ay)))
+
+    def add_entities(self, blits, game, alpha=1.0):
+        """Agrega a `blits` las entidades visibles en el orden de dibujo original."""
+        place = self._place
+        ground = SCREEN_HEIGHT - 50
+        camera_x = game.camera_at(alpha)
+        # Lo quieto en el mundo se recorta con un rango de x alrededor de la cámara
+        left = camera_x - TURRET_RADIUS
+        right = camera_x + SCREEN_WIDTH + TURRET_RADIUS
+        tick = game.ticks
+
+        for o in game.obstacles.range(camera_x - Obstacle.WIDTH, right):
+            place(blits, self.obstacle(o.height, o.width), o.x - camera_x, ground - o.height)
+        for c in game.coins.range(left, right):
+            place(blits, self.coin, c.x - camera_x, c.y + c.bob_offset(tick))
+        # Las torretas apuntan a donde estaba el helicóptero en el último tick
+        heli = game.helicopter
+        pips = None if self.simple else self.turret_pips
+        for t in game.turrets.range(left, right):
+            x = t.x - camera_x
+            place(blits, self.turret(t.aim(heli.x, heli.y, game.camera_x)), x, t.y)
+            if pips:
+                place(blits, pips[max(0, min(3, t.health))], x, t.y)
+        blits.extend(game.bullets.blit_sequence(self.bullet, alpha))
+        blits.extend(game.enemy_bullets.blit_sequence(self.enemy_bullet, alpha))
+        for m in game.medikits:
+            place(blits, self.medikit, lerp(m.px, m.x, alpha) - camera_x, m.y)
+
+    def add_helicopter(self, blits, heli, alpha=1.0):
+        x = lerp(heli.px, heli.x, alpha)
+        y = lerp(heli.py, heli.y, alpha)
+        self._place(blits, self.helicopter[self.helicopter_frame(heli.rotor_angle)], x, y)
+        self._place(blits, self.health_bar(heli.health, heli.max_health), x, y)
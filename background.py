@@ -0,0 +1,165 @@
+import pygame
+import random
+
+SKY_BLUE = (135, 206, 250)
+DARK_BLUE = (25, 25, 112)
+GROUND_GREEN = (34, 139, 34)
+DARK_GREEN = (0, 100, 0)
+CLOUD_WHITE = (255, 255, 255, 200)
+
+GROUND_HEIGHT = 50
+STRIPE_SPACING = 100
+STRIPE_WIDTH = 50
+# Fracción del avance de la cámara con que se mueve el suelo
+GROUND_PARALLAX = 0.4
+# Espacio extra que recorre una nube fuera de pantalla antes de volver a entrar
+CLOUD_GAP = 100
+
+
+def _prepare(surf, alpha=False):
+    """Convierte la superficie al formato de la pantalla si ya hay una ventana."""
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+class Background:
+    """
+    Fondo por capas pre-renderizadas:
+    - El degradado del cielo se dibuja una sola vez.
+    - Cada nube tiene su propio sprite.
+    - El suelo es una franja cacheada que solo se desplaza.
+    Las capas se reconstruyen únicamente si cambia la resolución. Nada
+    avanza por su cuenta: suelo y nubes se ubican a partir de la posición
+    de la cámara, con parallax.
+    set_detail() (lo usa el gobernador de calidad) limita cuántas nubes se
+    ven y puede dejarlas fijas: entonces se pintan una vez sobre una copia
+    del cielo y el fondo queda en dos blits.
+    """
+
+    def __init__(self, width, height, num_clouds=6, rng=random):
+        self.num_clouds = num_clouds
+        self.size = (width, height)
+        self.sky = None
+        self.ground = None
+        self.cloud_sprites = {}
+        self.visible_clouds = num_clouds
+        self.animated = True
+        # Cielo con las nubes fijas ya pintadas (solo sin animación)
+        self.still_sky = None
+        self.reset(rng)
+        self.build(width, height)
+
+    def reset(self, rng=random):
+        """Nubes nuevas a partir de `rng`; las capas ya dibujadas se reutilizan."""
+        self.rng = rng
+        width = self.size[0]
+        # Cada nube: [x inicial, y, ancho, alto, parallax, vuelta]
+        self.clouds = [
+            [rng.randint(0, width), rng.randint(50, 200),
+             rng.randint(100, 180), rng.randint(50, 80),
+             rng.uniform(0.12, 0.4), 0]
+            for _ in range(self.num_clouds)
+        ]
+        self.still_sky = None
+        # Los sprites de las nubes nuevas se preparan ahora y no en el primer dibujo
+        self._build_clouds()
+
+    def set_detail(self, clouds, animated=True):
+        """Cuántas nubes se dibujan y si se mueven con la cámara."""
+        clouds = min(clouds, self.num_clouds)
+        if (clouds, animated) != (self.visible_clouds, self.animated):
+            self.visible_clouds = clouds
+            self.animated = animated
+            self.still_sky = None
+
+    # ---------------------------------------
+    # CONSTRUCCIÓN DE CAPAS
+    # ---------------------------------------
+    def build(self, width, height):
+        self.size = (width, height)
+        self.sky = self._render_sky(width, height - GROUND_HEIGHT)
+        self.ground = self._render_ground(width)
+        self.still_sky = None
+        self._build_clouds()
+
+    def _build_clouds(self):
+        """Deja en caché solo los sprites de las nubes actuales (reutiliza los que ya estaban)."""
+        previous = self.cloud_sprites
+        self.cloud_sprites = {}
+        for cloud in self.clouds:
+            size = (cloud[2], cloud[3])
+            if size in previous:
+                self.cloud_sprites[size] = previous[size]
+            else:
+                self._cloud_sprite(*size)
+
+    @staticmethod
+    def _render_sky(width, height):
+        # Una columna de 1px con el degradado, estirada al ancho de la pantalla
+        column = pygame.Surface((1, height))
+        for y in range(height):
+            ratio = y / height
+            column.set_at((0, y), (
+                int(SKY_BLUE[0] + (DARK_BLUE[0] - SKY_BLUE[0]) * ratio),
+                int(SKY_BLUE[1] + (DARK_BLUE[1] - SKY_BLUE[1]) * ratio),
+                int(SKY_BLUE[2] + (DARK_BLUE[2] - SKY_BLUE[2]) * ratio)
+            ))
+        return _prepare(pygame.transform.scale(column, (width, height)))
+
+    @staticmethod
+    def _render_ground(width):
+        # Franja un periodo más ancha que la pantalla para poder desplazarla
+        strip = pygame.Surface((width + STRIPE_SPACING, GROUND_HEIGHT))
+        strip.fill(GROUND_GREEN)
+        for i in range(0, width + STRIPE_SPACING, STRIPE_SPACING):
+            pygame.draw.rect(strip, DARK_GREEN, (i, 0, STRIPE_WIDTH, GROUND_HEIGHT))
+        return _prepare(strip)
+
+    def _cloud_sprite(self, w, h):
+        sprite = self.cloud_sprites.get((w, h))
+        if sprite is None:
+            sprite = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.ellipse(sprite, CLOUD_WHITE, (0, 0, w, h))
+            sprite = _prepare(sprite, alpha=True)
+            self.cloud_sprites[(w, h)] = sprite
+        return sprite
+
+    # ---------------------------------------
+    # DIBUJO
+    # ---------------------------------------
+
+    def blit_sequence(self, screen, camera_x):
+        """Lista de (superficie, posición) del fondo con la cámara en `camera_x`."""
+        width, height = screen.get_size()
+        if self.size != (width, height):
+            self.build(width, height)
+
+        ground_x = -(int(camera_x * GROUND_PARALLAX) % STRIPE_SPACING)
+        ground = (self.ground, (ground_x, height - GROUND_HEIGHT))
+        if not self.animated:
+            if self.still_sky is None:
+                # Las nubes quedan donde estaban al dejar de animarse
+                self.still_sky = self.sky.copy()
+                self.still_sky.blits(self._cloud_blits(width, camera_x), doreturn=False)
+            return [(self.still_sky, (0, 0)), ground]
+
+        blits = [(self.sky, (0, 0))]
+        blits.extend(self._cloud_blits(width, camera_x))
+        blits.append(ground)
+        return blits
+
+    def _cloud_blits(self, width, camera_x):
+        blits = []
+        for cloud in self.clouds[:self.visible_clouds]:
+            x0, y, w, h, parallax, lap = cloud
+            # Al salir por la izquierda la nube vuelve a entrar por la derecha
+            span = width + w + CLOUD_GAP
+            travel = camera_x * parallax - x0 - w
+            current = int(travel // span) + 1 if travel >= 0 else 0
+            if current != lap:
+                cloud[5] = current
+                cloud[1] = y = self.rng.randint(40, 220)
+            x = x0 - camera_x * parallax + current * span
+            blits.append((self._cloud_sprite(w, h), (x, y)))
+        return blits
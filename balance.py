@@ -0,0 +1,300 @@
+"""
+Balanceo por Monte Carlo de los parámetros de dificultad (ver tuning.py).
+
+Para cada combinación de la rejilla juega muchas partidas headless con
+semillas fijas y un piloto automático, repartidas en todos los núcleos, y
+escribe un informe con:
+- Curva de supervivencia: fracción de partidas vivas a cada distancia.
+- Distribuciones de score y distancia.
+- Histograma del tiempo hasta morir.
+Todas las combinaciones usan las mismas semillas, así las diferencias
+salen de los parámetros y no del azar de cada nivel.
+
+Uso:
+    python balance.py --runs 1000 --grid turret_cooldown=50,70,90 --grid enemy_bullet_speed=5,6.5,8
+    python balance.py --runs 200 --pilot hover --out informe_balance
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import csv
+import itertools
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from controls import UP, DOWN, SHOOT
+from display import SCREEN_HEIGHT
+from headless import hover_pilot
+from tuning import Tuning, DEFAULTS
+
+MAX_TICKS = 100_000
+# Partidas por tarea enviada a un proceso
+BATCH_SIZE = 25
+HISTOGRAM_BINS = 20
+# Distancias de la curva de supervivencia que van al informe
+SURVIVAL_STEP = 250
+CRUISE_Y = 250
+
+
+# ---------------------------------------
+# PILOTOS
+# ---------------------------------------
+def dodge_pilot(tick, game):
+    """
+    Dispara sin parar y elige una altura objetivo:
+    - la de la próxima moneda por delante, si hay;
+    - por encima de los obstáculos cercanos;
+    - lejos de la bala enemiga más amenazante.
+    """
+    heli = game.helicopter
+    hx, hy = heli.x, heli.y
+    wx = hx + game.camera_x
+    target_y = CRUISE_Y
+
+    coins = game.coins.range(wx, wx + 300)
+    if coins:
+        target_y = coins[0].y
+    for obstacle in game.obstacles.range(wx - 90, wx + 250):
+        target_y = min(target_y, SCREEN_HEIGHT - 50 - obstacle.height - 60)
+    bullets = game.enemy_bullets
+    n = len(bullets)
+    if n:
+        offset = bullets.positions() - (hx, hy)
+        dx, dy = offset[:, 0], offset[:, 1]
+        threats = np.flatnonzero((dx > -40) & (dx < 160) & (np.abs(dy) < 70))
+        if len(threats):
+            target_y = hy + (90 if dy[threats[0]] < 0 else -90)
+
+    # Controla con la altura prevista unos ticks adelante
+    predicted = hy + heli.velocity_y * 6
+    mask = SHOOT
+    if predicted > target_y + 5:
+        mask |= UP
+    elif predicted < target_y - 30:
+        mask |= DOWN
+    return mask
+
+
+PILOTS = {"hover": hover_pilot, "dodge": dodge_pilot}
+
+
+# ---------------------------------------
+# SIMULACIÓN
+# ---------------------------------------
+_game = None
+
+
+def _run_batch(index, values, seeds, pilot_name, max_ticks):
+    """Juega una tanda de semillas con una combinación; corre en un proceso de trabajo."""
+    global _game
+    if _game is None:
+        from game import Game
+        _game = Game("Balanceo", headless=True, seed=0)
+    game = _game
+    game.tuning = Tuning(**values)
+    pilot = PILOTS[pilot_name]
+
+    results = []
+    for seed in seeds:
+        game.reset(seed=seed)
+        game.recorder = None
+        ticks = 0
+        while not (game.game_over or game.won) and ticks < max_ticks:
+            game.tick(pilot(ticks, game))
+            ticks += 1
+        results.append((seed, ticks, game.distance, game.score, game.game_over, game.won,
+                        game.helicopter.health))
+    return index, results
+
+
+def sweep(settings, runs, pilot="dodge", workers=None, max_ticks=MAX_TICKS, seed=0):
+    """
+    Juega `runs` partidas (semillas seed..seed+runs-1) por cada Tuning de
+    `settings` en un pool de procesos. Devuelve, por combinación, un arreglo
+    estructurado con una fila por partida.
+    """
+    seeds = list(range(seed, seed + runs))
+    batches = [seeds[i:i + BATCH_SIZE] for i in range(0, runs, BATCH_SIZE)]
+    results = [[] for _ in settings]
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=ctx) as pool:
+        futures = [pool.submit(_run_batch, i, tuning.as_dict(), batch, pilot, max_ticks)
+                   for i, tuning in enumerate(settings) for batch in batches]
+        for future in as_completed(futures):
+            index, rows = future.result()
+            results[index].extend(rows)
+
+    dtype = [("seed", np.int64), ("ticks", np.int64), ("distance", np.int64), ("score", np.int64),
+             ("died", np.bool_), ("won", np.bool_), ("health", np.int64)]
+    return [np.sort(np.array(rows, dtype=dtype), order="seed") for rows in results]
+
+
+def parse_grid(specs):
+    """["turret_cooldown=50,70", ...] -> lista de Tuning con el producto cartesiano."""
+    axes = []
+    for spec in specs:
+        name, _, raw = spec.partition("=")
+        if name not in DEFAULTS or not raw:
+            raise ValueError(f"rejilla inválida: {spec!r} (parámetros: {', '.join(DEFAULTS)})")
+        kind = type(DEFAULTS[name])
+        axes.append([(name, kind(v)) for v in raw.split(",")])
+    return [Tuning(**dict(combo)) for combo in itertools.product(*axes)]
+
+
+# ---------------------------------------
+# INFORME
+# ---------------------------------------
+def survival_curve(runs, distances):
+    """Fracción de partidas que llegaron a cada distancia."""
+    return [float(np.mean(runs["distance"] >= d)) for d in distances]
+
+
+def summarize(runs):
+    died = runs[runs["died"]]
+    return {
+        "partidas": len(runs),
+        "ganadas": float(np.mean(runs["won"])),
+        "muertes": float(np.mean(runs["died"])),
+        "score_media": float(np.mean(runs["score"])),
+        "score_p10": float(np.percentile(runs["score"], 10)),
+        "score_p50": float(np.percentile(runs["score"], 50)),
+        "score_p90": float(np.percentile(runs["score"], 90)),
+        "distancia_media": float(np.mean(runs["distance"])),
+        "distancia_p50": float(np.percentile(runs["distance"], 50)),
+        "muerte_p50_s": float(np.percentile(died["ticks"], 50)) / 60 if len(died) else None,
+    }
+
+
+def _edges(values, bins=HISTOGRAM_BINS):
+    """Bordes comunes a todas las combinaciones, para poder compararlas."""
+    values = np.concatenate(values) if values else np.zeros(1)
+    high = max(float(values.max()), float(values.min()) + 1)
+    return np.linspace(float(values.min()), high, bins + 1)
+
+
+def _label(tuning):
+    changes = tuning.changes()
+    return ", ".join(f"{k}={v}" for k, v in changes.items()) if changes else "por defecto"
+
+
+def _bar(fraction, width=30):
+    return "#" * round(fraction * width)
+
+
+def write_report(out_dir, settings, results, elapsed, pilot):
+    os.makedirs(out_dir, exist_ok=True)
+    labels = [_label(t) for t in settings]
+    max_distance = max(int(r["distance"].max()) for r in results)
+    distances = list(range(0, max_distance + SURVIVAL_STEP, SURVIVAL_STEP))
+
+    # Partidas sueltas
+    with open(os.path.join(out_dir, "runs.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(DEFAULTS) + list(results[0].dtype.names))
+        for tuning, runs in zip(settings, results):
+            params = list(tuning.as_dict().values())
+            for row in runs:
+                writer.writerow(params + [v.item() for v in row])
+
+    # Curvas de supervivencia (una columna por combinación)
+    curves = [survival_curve(runs, distances) for runs in results]
+    with open(os.path.join(out_dir, "survival.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["distancia"] + labels)
+        for i, d in enumerate(distances):
+            writer.writerow([d] + [f"{curve[i]:.4f}" for curve in curves])
+
+    # Histogramas de score, distancia y tiempo hasta morir (en segundos)
+    metrics = {
+        "score": [r["score"] for r in results],
+        "distancia": [r["distance"] for r in results],
+        "muerte_s": [r["ticks"][r["died"]] / 60 for r in results],
+    }
+    histograms = {}
+    with open(os.path.join(out_dir, "histograms.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["métrica", "desde", "hasta"] + labels)
+        for metric, values in metrics.items():
+            edges = _edges([v for v in values if len(v)])
+            counts = [np.histogram(v, bins=edges)[0] for v in values]
+            histograms[metric] = (edges, counts)
+            for b in range(len(edges) - 1):
+                writer.writerow([metric, f"{edges[b]:.2f}", f"{edges[b + 1]:.2f}"]
+                                + [int(c[b]) for c in counts])
+
+    # Resumen legible
+    lines = [
+        "# Informe de balanceo",
+        "",
+        f"Piloto: {pilot}. {len(results[0])} partidas por combinación, "
+        f"{len(settings)} combinaciones, {elapsed:.1f} s.",
+        "",
+        "| combinación | ganadas | muertes | score media | score p10/p50/p90 | distancia p50 | muerte p50 (s) |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for label, runs in zip(labels, results):
+        s = summarize(runs)
+        death = f"{s['muerte_p50_s']:.1f}" if s["muerte_p50_s"] is not None else "-"
+        lines.append(f"| {label} | {s['ganadas']:.1%} | {s['muertes']:.1%} | {s['score_media']:.0f} | "
+                     f"{s['score_p10']:.0f}/{s['score_p50']:.0f}/{s['score_p90']:.0f} | "
+                     f"{s['distancia_p50']:.0f} | {death} |")
+
+    lines += ["", "## Supervivencia por distancia", "",
+              "| distancia | " + " | ".join(labels) + " |",
+              "|---" * (len(labels) + 1) + "|"]
+    step = max(1, 1000 // SURVIVAL_STEP)
+    for i in range(0, len(distances), step):
+        lines.append(f"| {distances[i]} | " + " | ".join(f"{c[i]:.1%}" for c in curves) + " |")
+
+    for metric, title in (("muerte_s", "Tiempo hasta morir (s)"), ("score", "Score")):
+        edges, counts = histograms[metric]
+        lines += ["", f"## {title}"]
+        for label, count in zip(labels, counts):
+            total = max(1, int(count.sum()))
+            lines += ["", f"{label} ({int(count.sum())} partidas)", "```"]
+            for b, c in enumerate(count):
+                lines.append(f"{edges[b]:8.1f} - {edges[b + 1]:8.1f} {int(c):6d} {_bar(c / total)}")
+            lines.append("```")
+
+    with open(os.path.join(out_dir, "report.md"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return os.path.join(out_dir, "report.md")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balanceo por Monte Carlo de Helicopter Shooter")
+    parser.add_argument("--grid", action="append", default=[], metavar="PARAM=V1,V2,...",
+                        help=f"valores a barrer; se puede repetir ({', '.join(DEFAULTS)})")
+    parser.add_argument("--runs", type=int, default=200, help="partidas por combinación")
+    parser.add_argument("--seed", type=int, default=0, help="primera semilla")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="dodge")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--out", default="balance_report", help="carpeta del informe")
+    args = parser.parse_args()
+
+    try:
+        settings = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"{len(settings)} combinaciones x {args.runs} partidas ({args.pilot})")
+    start = time.perf_counter()
+    results = sweep(settings, args.runs, args.pilot, args.workers, args.max_ticks, args.seed)
+    elapsed = time.perf_counter() - start
+    for tuning, runs in zip(settings, results):
+        s = summarize(runs)
+        print(f"  {_label(tuning):50s} ganadas {s['ganadas']:6.1%}  score p50 {s['score_p50']:6.0f}  "
+              f"distancia p50 {s['distancia_p50']:6.0f}")
+    path = write_report(args.out, settings, results, elapsed, args.pilot)
+    print(f"Informe en {path} ({elapsed:.1f} s)")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""
+Benchmark de tiempos por frame con cargas de entidades escaladas.
+
+Para cada escenario se construye un estado de Game con N entidades de cada
+tipo (Bullet, EnemyBullet, Turret, Coin, Obstacle) y N partículas, y se mide
+por separado update, draw y el frame completo (p50/p95/p99 en ms), además de
+la memoria asignada por frame.
+
+Uso:
+    python benchmark.py                         # corre y compara con el baseline
+    python benchmark.py --save-baseline         # guarda los resultados como baseline
+    python benchmark.py --scales 10,100 --frames 30 --tolerance 0.2
+    python benchmark.py --render-scale 0.5      # dibujando a media resolución
+    python benchmark.py --quality 3             # con el nivel de detalle mínimo
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import gc
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+from game import Game
+from resources import Resources
+from display import SCREEN_WIDTH, SCREEN_HEIGHT
+from entities import Helicopter, Bullet, ENEMY_BULLET_SPEED
+from controls import KeyState
+
+DEFAULT_SCALES = (10, 100, 1000, 10000)
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# Diferencias menores a esto (ms) se consideran ruido aunque superen la tolerancia
+NOISE_FLOOR_MS = 0.05
+
+
+# ---------------------------------------
+# ESCENARIOS
+# ---------------------------------------
+def populate(game, n, rng):
+    """Llena el juego con n entidades de cada tipo, lejos del helicóptero."""
+    game.helicopter = Helicopter(200, SCREEN_HEIGHT // 2)
+    # Cámara en el origen: las entidades quietas están en coordenadas de mundo
+    # y el juego se reutiliza entre escenarios (cada update la hace avanzar)
+    game.camera_x = 0
+    game.prev_camera_x = 0
+    game.ticks = 0
+    game.game_over = False
+    game.won = False
+    game.paused = False
+
+    def pos(y_min=60, y_max=SCREEN_HEIGHT - 120):
+        return rng.uniform(320, SCREEN_WIDTH - 40), rng.uniform(y_min, y_max)
+
+    for container in (game.bullets, game.enemy_bullets, game.turrets,
+                      game.coins, game.obstacles, game.medikits):
+        container.clear()
+    for _ in range(n):
+        game.bullets.spawn(*pos(), Bullet.SPEED, 0.0)
+        angle = rng.uniform(0, 2 * math.pi)
+        game.enemy_bullets.spawn(*pos(), math.cos(angle) * ENEMY_BULLET_SPEED,
+                                 math.sin(angle) * ENEMY_BULLET_SPEED)
+        game.turrets.spawn(*pos(150, SCREEN_HEIGHT - 180))
+        game.coins.spawn(*pos(100, SCREEN_HEIGHT - 200))
+        game.obstacles.spawn(rng.uniform(320, SCREEN_WIDTH - 40), rng.randint(70, 180))
+
+    particles = game.particle_system
+    particles.clear()
+    # Con un nivel de calidad bajo el tope es menor (ver quality.py)
+    while len(particles) < min(n, particles.capacity, particles.limit):
+        x, y = pos()
+        particles.add_explosion(x, y, n - len(particles))
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(q):
+        idx = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[idx] * 1000
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def run_scenario(game, n, frames, budget, seed):
+    rng = random.Random(seed)
+    idle = KeyState(0)
+    update_t, draw_t, frame_t, alloc = [], [], [], []
+    started = time.perf_counter()
+
+    for i in range(frames):
+        populate(game, n, rng)
+        gc.collect()
+
+        t0 = time.perf_counter()
+        game.update(idle)
+        t1 = time.perf_counter()
+        game.draw()
+        t2 = time.perf_counter()
+        update_t.append(t1 - t0)
+        draw_t.append(t2 - t1)
+        frame_t.append(t2 - t0)
+
+        # Medición de memoria aparte: tracemalloc distorsiona los tiempos
+        if i < 3:
+            populate(game, n, rng)
+            tracemalloc.start()
+            game.update(idle)
+            game.draw()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            alloc.append(peak / 1024)
+
+        if time.perf_counter() - started > budget and i >= 2:
+            break
+
+    return {
+        "frames": len(frame_t),
+        "update": percentiles(update_t),
+        "draw": percentiles(draw_t),
+        "frame": percentiles(frame_t),
+        "alloc_kib": sum(alloc) / len(alloc),
+    }
+
+
+# ---------------------------------------
+# BASELINE
+# ---------------------------------------
+def compare(results, baseline, tolerance):
+    """Devuelve la lista de regresiones respecto al baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for phase in ("update", "draw", "frame"):
+            for q in ("p50", "p95"):
+                old, new = previous[phase][q], current[phase][q]
+                if new > old * (1 + tolerance) and new - old > NOISE_FLOOR_MS:
+                    regressions.append(f"{name} {phase} {q}: {old:.3f} -> {new:.3f} ms "
+                                       f"(+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de frame de Helicopter Shooter")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="cantidades de entidades por tipo, separadas por coma")
+    parser.add_argument("--frames", type=int, default=60, help="frames medidos por escenario")
+    parser.add_argument("--budget", type=float, default=20.0,
+                        help="segundos máximos por escenario (mínimo 3 frames)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="regresión permitida (0.15 = 15%%)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="resolución interna de dibujo (ver display.py)")
+    parser.add_argument("--smooth", action="store_true", help="estira el lienzo con smoothscale")
+    parser.add_argument("--quality", type=int, default=0,
+                        help="nivel de detalle fijo (ver quality.py); 0 es el más alto")
+    args = parser.parse_args()
+
+    pygame.font.init()
+    resources = Resources(headless=True, render_scale=args.render_scale, smooth=args.smooth,
+                          quality_level=args.quality)
+    game = Game("Benchmark", headless=True, seed=args.seed, resources=resources)
+
+    results = {}
+    print(f"{'escenario':>10} {'fase':>7} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+    for n in (int(s) for s in args.scales.split(",")):
+        name = f"n={n}"
+        res = run_scenario(game, n, args.frames, args.budget, args.seed)
+        results[name] = res
+        for phase in ("update", "draw", "frame"):
+            p = res[phase]
+            print(f"{name:>10} {phase:>7} {p['p50']:9.3f} {p['p95']:9.3f} {p['p99']:9.3f}")
+        print(f"{name:>10} {'alloc':>7} {res['alloc_kib']:9.1f} KiB/frame  ({res['frames']} frames)")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline guardado en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Sin baseline en {args.baseline}; usa --save-baseline para crearlo")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("REGRESIONES:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    print("Sin regresiones respecto al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
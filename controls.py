@@ -0,0 +1,36 @@
+import pygame
+
+# Bits de entrada por tick (teclas mantenidas + acciones de un solo toque)
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+SHOOT = 16
+PAUSE = 32
+
+_KEY_BITS = {
+    pygame.K_UP: UP, pygame.K_w: UP,
+    pygame.K_DOWN: DOWN, pygame.K_s: DOWN,
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+}
+
+
+class KeyState:
+    """Imita el resultado de pygame.key.get_pressed() a partir de una máscara de bits."""
+    __slots__ = ("mask",)
+
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & _KEY_BITS.get(key, 0))
+
+
+def mask_from_keys(pressed):
+    """Convierte el estado real del teclado en la máscara de teclas mantenidas."""
+    mask = 0
+    for key, bit in _KEY_BITS.items():
+        if pressed[key]:
+            mask |= bit
+    return mask
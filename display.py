@@ -0,0 +1,89 @@
+"""
+Resolución del juego y lienzo interno de dibujo.
+
+SCREEN_WIDTH x SCREEN_HEIGHT es el tamaño de la ventana y, a la vez, el
+sistema de coordenadas de toda la lógica: eso no cambia con la escala de
+render. La escala solo decide en cuántos píxeles se dibuja el mundo antes
+de estirarlo a la ventana (ver Display).
+"""
+import weakref
+
+import pygame
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 700
+SCREEN_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+# Escalas de render interno sugeridas (1.0 = resolución de la ventana)
+RENDER_SCALES = (1.0, 0.75, 0.5)
+
+
+def _resize(surf, size, smooth, dest=None):
+    """transform.smoothscale si se pide y la superficie lo admite; si no, transform.scale."""
+    args = (surf, size) if dest is None else (surf, size, dest)
+    if smooth and surf.get_bitsize() in (24, 32):
+        return pygame.transform.smoothscale(*args)
+    return pygame.transform.scale(*args)
+
+
+class Display:
+    """
+    Lienzo donde se dibuja el mundo y su presentación en la ventana:
+    - Con scale=1 el lienzo es la ventana misma: nada cambia ni cuesta de más.
+    - Con scale<1 el mundo se dibuja en una superficie más chica. Cada
+      sprite se reduce una sola vez (caché por superficie) y solo se
+      escalan las posiciones; present() estira el lienzo a la ventana con
+      una sola transform.scale (o smoothscale) por frame.
+    - Lo que se pasa a present() (HUD, textos) va encima, a resolución nativa.
+    Las listas de blits siguen en coordenadas de juego.
+    """
+
+    def __init__(self, window, scale=1.0, smooth=False):
+        if not 0 < scale <= 1:
+            raise ValueError(f"escala de render inválida: {scale} (debe estar en (0, 1])")
+        self.window = window
+        self.scale = scale
+        self.smooth = smooth
+        self.size = window.get_size()
+        if scale == 1:
+            self.canvas = window
+        else:
+            width, height = self.size
+            canvas_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            self.canvas = pygame.Surface(canvas_size, 0, window)
+        # Sprite original -> sprite reducido; se olvida solo cuando el original se libera
+        self._scaled = weakref.WeakKeyDictionary()
+
+    @property
+    def scaled(self):
+        return self.canvas is not self.window
+
+    def _shrink(self, surf):
+        width, height = surf.get_size()
+        if not width or not height:
+            small = surf
+        else:
+            scale = self.scale
+            # Con colorkey no se suaviza: mezclaría el color clave con los bordes
+            small = _resize(surf, (max(1, round(width * scale)), max(1, round(height * scale))),
+                            surf.get_colorkey() is None)
+        self._scaled[surf] = small
+        return small
+
+    def draw(self, blits):
+        """Dibuja en el lienzo una lista de (superficie, posición) en coordenadas de juego."""
+        if not self.scaled:
+            self.window.blits(blits, doreturn=False)
+            return
+        scale = self.scale
+        cached = self._scaled.get
+        shrink = self._shrink
+        self.canvas.blits([(cached(surf) or shrink(surf), (int(x * scale), int(y * scale)))
+                           for surf, (x, y) in blits], doreturn=False)
+
+    def present(self, overlay=()):
+        """Lleva el lienzo a la ventana y dibuja encima `overlay` a resolución nativa."""
+        if self.scaled:
+            _resize(self.canvas, self.size, self.smooth, self.window)
+        if overlay:
+            self.window.blits(overlay, doreturn=False)
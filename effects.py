@@ -1,97 +1,278 @@
 import pygame
 import numpy as np
+import hashlib
+import json
 import math
-import random
-from dataclasses import dataclass
-from typing import Tuple, List
+import os
+import tempfile
 
-pygame.mixer.init()
 
-
-@dataclass
-class Particle:
-    x: float
-    y: float
-    vx: float
-    vy: float
-    life: int
-    color: Tuple[int, int, int]
-    size: float
+PARTICLE_COLORS = np.array([(255, 69, 0), (255, 215, 0), (255, 255, 0)], dtype=np.uint8)
+PARTICLE_ALPHA = 200
+MAX_PARTICLE_RADIUS = 8
 
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles: List[Particle] = []
+    """
+    Motor de partículas en estructura de arreglos (NumPy):
+    - Posición, velocidad, vida, tamaño y color viven en arreglos preasignados.
+    - update() aplica gravedad, desgaste y descarte en una sola pasada vectorizada.
+    - Las partículas muertas se compactan intercambiándolas con las vivas del final.
+    - blit_sequence() usa sprites de círculo pre-renderizados por (radio, color).
+    - emission y limit (los ajusta el gobernador de calidad) recortan cuántas
+      partículas genera cada explosión y cuántas puede haber vivas.
+    """
+
+    def __init__(self, capacity=10000, rng=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.emission = 1.0
+        self.limit = capacity
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color)
+        self._sprites = None
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def snapshot(self):
+        """Copia de las partículas vivas y del estado del RNG (para repeticiones)."""
+        n = self.count
+        return n, [a[:n].copy() for a in self._arrays], self.rng.bit_generator.state
+
+    def restore(self, state):
+        n, arrays, rng_state = state
+        for dst, src in zip(self._arrays, arrays):
+            dst[:n] = src
+        self.count = n
+        self.rng.bit_generator.state = rng_state
 
     def add_explosion(self, x, y, intensity=20):
-        for _ in range(intensity):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 8)
-            self.particles.append(Particle(
-                x, y,
-                math.cos(angle) * speed,
-                math.sin(angle) * speed,
-                random.randint(30, 60),
-                random.choice([(255, 69, 0), (255, 215, 0), (255, 255, 0)]),
-                random.uniform(3, 8)
-            ))
+        # Con emisión reducida cada explosión conserva al menos una partícula
+        n = min(max(1, round(intensity * self.emission)), min(self.limit, self.capacity) - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        angle = self.rng.uniform(0, 2 * math.pi, n)
+        speed = self.rng.uniform(2, 8, n)
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = np.cos(angle) * speed
+        self.vy[s] = np.sin(angle) * speed
+        self.life[s] = self.rng.integers(30, 61, n)
+        self.color[s] = self.rng.integers(0, len(PARTICLE_COLORS), n)
+        self.size[s] = self.rng.uniform(3, 8, n)
+        self.count += n
 
     def update(self):
-        for p in self.particles[:]:
-            p.x += p.vx
-            p.y += p.vy
-            p.vy += 0.1
-            p.life -= 1
-            p.size *= 0.97
-            if p.life <= 0 or p.size < 0.5:
-                self.particles.remove(p)
-
-    def draw(self, screen):
-        for p in self.particles:
-            surf = pygame.Surface((p.size * 2, p.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*p.color, 200), (int(p.size), int(p.size)), int(p.size))
-            screen.blit(surf, (p.x - p.size, p.y - p.size))
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        life, size = self.life[:n], self.size[:n]
+
+        x += vx
+        y += vy
+        vy += 0.1
+        life -= 1
+        size *= 0.97
+
+        alive = (life > 0) & (size >= 0.5)
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            # Huecos al principio se rellenan con partículas vivas del final
+            holes = np.flatnonzero(~alive[:alive_count])
+            sources = np.flatnonzero(alive[alive_count:]) + alive_count
+            for arr in self._arrays:
+                arr[holes] = arr[sources]
+            self.count = alive_count
+
+    # ---------------------------------------
+    # DIBUJO
+    # ---------------------------------------
+    def _build_sprites(self):
+        # Índice = radio * número de colores + color
+        sprites = []
+        for radius in range(MAX_PARTICLE_RADIUS + 1):
+            for color in PARTICLE_COLORS:
+                surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                if radius > 0:
+                    pygame.draw.circle(surf, (*color.tolist(), PARTICLE_ALPHA), (radius, radius), radius)
+                if pygame.display.get_surface() is not None:
+                    surf = surf.convert_alpha()
+                sprites.append(surf)
+        return sprites
+
+    def blit_sequence(self):
+        """Lista de (sprite, posición) lista para Surface.blits."""
+        n = self.count
+        if n == 0:
+            return []
+        if self._sprites is None:
+            self._sprites = self._build_sprites()
+
+        radius = self.size[:n].astype(np.int32)
+        visible = radius > 0
+        radius = radius[visible]
+        keys = radius * len(PARTICLE_COLORS) + self.color[:n][visible]
+        px = (self.x[:n][visible] - radius).astype(np.int32)
+        py = (self.y[:n][visible] - radius).astype(np.int32)
+
+        sprites = self._sprites
+        return [(sprites[k], (bx, by))
+                for k, bx, by in zip(keys.tolist(), px.tolist(), py.tolist())]
+
+
+SAMPLE_RATE = 22050
+SOUND_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sound_cache")
+SOUND_CACHE_VERSION = 1
+
+# Recetas de los efectos: describen el sonido, no las muestras
+SHOOT_SOUND = {"wave": "tone", "duration": 0.1, "freq": (800, 600), "volume": 0.25}
+EXPLOSION_SOUND = {"wave": "noise", "duration": 0.3, "volume": 0.4, "release": 1.0, "seed": 0}
+COIN_SOUND = {"wave": "tone", "duration": 0.15, "freq": (500, 800), "volume": 0.2}
 
 
 class SoundManager:
+    """
+    Sintetizador de efectos con NumPy:
+    - tone/noise/envelope generan ondas completas con operaciones vectorizadas.
+    - Cada receta se renderiza a PCM una sola vez y se guarda en disco,
+      indexada por el hash de su contenido.
+    """
+
+    # PCM ya cargado, por clave de receta (ver load_pcm)
+    _pcm = {}
+
+    @staticmethod
+    def init_mixer():
+        """El mezclador se abre recién al crear el primer sonido, no al importar."""
+        if pygame.mixer.get_init():
+            return True
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            return False
+        return True
+
     @staticmethod
     def _make_sound(arr):
+        if not SoundManager.init_mixer():
+            return None
         try:
             return pygame.sndarray.make_sound(arr)
         except:
             return None
 
+    # ---------------------------------------
+    # SÍNTESIS
+    # ---------------------------------------
+    @staticmethod
+    def tone(duration, freq_start, freq_end=None, sample_rate=SAMPLE_RATE):
+        """Seno con barrido lineal de frecuencia entre freq_start y freq_end."""
+        n = int(duration * sample_rate)
+        if freq_end is None:
+            freq_end = freq_start
+        i = np.arange(n)
+        t = i / sample_rate
+        freq = freq_start + (freq_end - freq_start) * (i / n)
+        return np.sin(2 * math.pi * freq * t)
+
+    @staticmethod
+    def noise(duration, seed=0, sample_rate=SAMPLE_RATE):
+        """Ruido blanco uniforme en [-1, 1), reproducible por semilla."""
+        n = int(duration * sample_rate)
+        return np.random.default_rng(seed).random(n) * 2 - 1
+
+    @staticmethod
+    def envelope(n, attack=0.0, release=0.0):
+        """Envolvente lineal: sube durante `attack` y baja durante `release` (fracciones de n)."""
+        env = np.ones(n)
+        i = np.arange(n)
+        a = int(attack * n)
+        r = int(release * n)
+        if a > 0:
+            env[:a] = i[:a] / a
+        if r > 0:
+            env[n - r:] = np.minimum(env[n - r:], (n - i[n - r:]) / r)
+        return env
+
+    @staticmethod
+    def to_pcm(wave, volume=1.0):
+        """Onda en [-1, 1] a PCM estéreo de 16 bits."""
+        mono = (32767 * volume * wave).astype(np.int16)
+        return np.ascontiguousarray(np.column_stack((mono, mono)))
+
+    @staticmethod
+    def render(spec):
+        if spec["wave"] == "tone":
+            wave = SoundManager.tone(spec["duration"], *spec["freq"])
+        elif spec["wave"] == "noise":
+            wave = SoundManager.noise(spec["duration"], spec.get("seed", 0))
+        else:
+            raise ValueError(f"Tipo de onda desconocido: {spec['wave']}")
+        if spec.get("attack") or spec.get("release"):
+            wave = wave * SoundManager.envelope(len(wave), spec.get("attack", 0.0), spec.get("release", 0.0))
+        return SoundManager.to_pcm(wave, spec.get("volume", 1.0))
+
+    # ---------------------------------------
+    # CACHÉ EN DISCO
+    # ---------------------------------------
+    @staticmethod
+    def cache_key(spec):
+        payload = json.dumps({"spec": spec, "rate": SAMPLE_RATE, "v": SOUND_CACHE_VERSION}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+    @staticmethod
+    def load_pcm(spec):
+        """Devuelve el PCM de la receta: de memoria, de disco o renderizándolo."""
+        key = SoundManager.cache_key(spec)
+        pcm = SoundManager._pcm.get(key)
+        if pcm is not None:
+            return pcm
+        path = os.path.join(SOUND_CACHE_DIR, key + ".npy")
+        try:
+            pcm = SoundManager._pcm[key] = np.load(path)
+            return pcm
+        except (OSError, ValueError):
+            pass
+
+        pcm = SoundManager._pcm[key] = SoundManager.render(spec)
+        try:
+            os.makedirs(SOUND_CACHE_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=SOUND_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, pcm)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return pcm
+
+    @staticmethod
+    def make(spec):
+        return SoundManager._make_sound(SoundManager.load_pcm(spec))
+
     @staticmethod
     def generate_shoot_sound():
-        sample_rate = 22050
-        n = int(0.1 * sample_rate)
-        arr = np.zeros((n, 2), dtype=np.int16)
-        for i in range(n):
-            t = i / sample_rate
-            freq = 800 - i / n * 200
-            value = int(32767 * 0.25 * math.sin(2 * math.pi * freq * t))
-            arr[i] = [value, value]
-        return SoundManager._make_sound(arr)
+        return SoundManager.make(SHOOT_SOUND)
 
     @staticmethod
     def generate_explosion_sound():
-        sample_rate = 22050
-        n = int(0.3 * sample_rate)
-        arr = np.zeros((n, 2), dtype=np.int16)
-        for i in range(n):
-            decay = 1 - i / n
-            value = int(32767 * 0.4 * decay * (random.random() * 2 - 1))
-            arr[i] = [value, value]
-        return SoundManager._make_sound(arr)
+        return SoundManager.make(EXPLOSION_SOUND)
 
     @staticmethod
     def generate_coin_sound():
-        sample_rate = 22050
-        n = int(0.15 * sample_rate)
-        arr = np.zeros((n, 2), dtype=np.int16)
-        for i in range(n):
-            t = i / sample_rate
-            freq = 500 + i / n * 300
-            value = int(32767 * 0.2 * math.sin(2 * math.pi * freq * t))
-            arr[i] = [value, value]
-        return SoundManager._make_sound(arr)
+        return SoundManager.make(COIN_SOUND)
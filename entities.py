@@ -1,9 +1,15 @@
 import pygame
 import math
-import random
+from bisect import bisect_left, bisect_right
+from display import SCREEN_WIDTH, SCREEN_HEIGHT
 
-SCREEN_WIDTH = 1200
-SCREEN_HEIGHT = 700
+# Avance de la cámara por tick: obstáculos, torretas y monedas están quietos
+# en el mundo y se ven moverse a esta velocidad
+SCROLL_SPEED = 2.5
+
+# Valores por defecto de dificultad (ver tuning.py)
+TURRET_COOLDOWN = 70
+ENEMY_BULLET_SPEED = 6.5  # más lento para mayor equilibrio
 
 # Colores
 HELICOPTER_BODY = (60, 60, 60)
@@ -18,10 +24,144 @@ STONE_DARK = (60, 60, 60)
 STONE_LIGHT = (150, 150, 150)
 
 
+def health_bar_color(health):
+    return (0, 255, 0) if health > 50 else (255, 255, 0) if health > 25 else (255, 0, 0)
+
+
+def lerp(a, b, alpha):
+    """Interpolación lineal entre la posición del tick anterior y la actual."""
+    return a + (b - a) * alpha
+
+
+# ---------------------------------------
+# POOLS Y CONTENEDORES
+# ---------------------------------------
+class Pool:
+    """Reserva de instancias reutilizables: acquire() reinicia una libre o crea una nueva."""
+    __slots__ = ("cls", "free")
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+
+    def acquire(self, *args):
+        obj = self.free.pop() if self.free else self.cls.__new__(self.cls)
+        obj.reset(*args)
+        return obj
+
+    def release(self, obj):
+        self.free.append(obj)
+
+
+class EntityList:
+    """
+    Lista de entidades con borrado O(1): el elemento quitado se reemplaza por
+    el último. Para borrar mientras se recorre, iterar por índice de atrás
+    hacia adelante.
+    """
+    __slots__ = ("items", "pool")
+
+    def __init__(self, cls):
+        self.items = []
+        self.pool = Pool(cls)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    def spawn(self, *args):
+        obj = self.pool.acquire(*args)
+        obj.index = len(self.items)
+        self.items.append(obj)
+        return obj
+
+    def remove(self, obj):
+        items = self.items
+        last = items.pop()
+        if last is not obj:
+            items[obj.index] = last
+            last.index = obj.index
+        self.pool.release(obj)
+
+    def clear(self):
+        for obj in self.items:
+            self.pool.release(obj)
+        self.items.clear()
+
+
+class SortedEntityList:
+    """
+    Entidades quietas en el mundo, ordenadas por x. La cámara solo avanza
+    hacia la derecha, así que lo que queda atrás es siempre un prefijo:
+    descartarlo y consultar un rango visible son búsquedas binarias, sin
+    recorrer cada entidad.
+    """
+    __slots__ = ("items", "xs", "pool")
+
+    def __init__(self, cls):
+        self.items = []
+        self.xs = []
+        self.pool = Pool(cls)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    def spawn(self, x, *args):
+        obj = self.pool.acquire(x, *args)
+        i = bisect_right(self.xs, x)
+        self.xs.insert(i, x)
+        self.items.insert(i, obj)
+        return obj
+
+    def remove(self, obj):
+        i = bisect_left(self.xs, obj.x)
+        while self.items[i] is not obj:
+            i += 1
+        del self.xs[i]
+        del self.items[i]
+        self.pool.release(obj)
+
+    def range(self, x_min, x_max):
+        """Entidades con x entre x_min y x_max (inclusive), en orden."""
+        return self.items[bisect_left(self.xs, x_min):bisect_right(self.xs, x_max)]
+
+    def drop_before(self, x):
+        """Descarta las entidades con x menor que `x`; devuelve cuántas."""
+        n = bisect_left(self.xs, x)
+        if n:
+            for obj in self.items[:n]:
+                self.pool.release(obj)
+            del self.items[:n]
+            del self.xs[:n]
+        return n
+
+    def clear(self):
+        for obj in self.items:
+            self.pool.release(obj)
+        self.items.clear()
+        self.xs.clear()
+
+
 class Helicopter:
+    __slots__ = ("x", "y", "px", "py", "width", "height", "velocity_y", "velocity_x",
+                 "health", "max_health", "rotor_angle", "tilt")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.px = x
+        self.py = y
         self.width = 60
         self.height = 30
         self.velocity_y = 0
@@ -32,6 +172,8 @@ class Helicopter:
         self.tilt = 0
 
     def update(self, keys):
+        self.px, self.py = self.x, self.y
+
         # Movimiento vertical
         if keys[pygame.K_UP] or keys[pygame.K_w]:
             self.velocity_y -= 0.45
@@ -66,38 +208,40 @@ class Helicopter:
         # Rotor
         self.rotor_angle = (self.rotor_angle + 20) % 360
 
-    def draw(self, screen):
+    @staticmethod
+    def draw_shape(screen, x, y, rotor_angle):
+        """Dibuja el helicóptero con primitivas (también lo usa el atlas de sprites)."""
         # Cuerpo
-        body_rect = pygame.Rect(self.x - 25, self.y - 10, 50, 20)
+        body_rect = pygame.Rect(x - 25, y - 10, 50, 20)
         pygame.draw.ellipse(screen, HELICOPTER_BODY, body_rect)
         pygame.draw.ellipse(screen, (40, 40, 40), body_rect, 2)
 
         # Cabina
-        cockpit_rect = pygame.Rect(self.x + 10, self.y - 8, 15, 16)
+        cockpit_rect = pygame.Rect(x + 10, y - 8, 15, 16)
         pygame.draw.ellipse(screen, (100, 150, 200), cockpit_rect)
         pygame.draw.ellipse(screen, (200, 220, 255),
-                            pygame.Rect(self.x + 12, self.y - 6, 8, 8))
+                            pygame.Rect(x + 12, y - 6, 8, 8))
 
         # Cola
         tail_points = [
-            (self.x - 25, self.y),
-            (self.x - 45, self.y - 5),
-            (self.x - 45, self.y + 5)
+            (x - 25, y),
+            (x - 45, y - 5),
+            (x - 45, y + 5)
         ]
         pygame.draw.polygon(screen, HELICOPTER_BODY, tail_points)
 
         # Rotor trasero
-        tail_rotor_x = self.x - 45
-        tail_rotor_y = self.y
+        tail_rotor_x = x - 45
+        tail_rotor_y = y
         pygame.draw.line(screen, HELICOPTER_ACCENT,
                          (tail_rotor_x - 5, tail_rotor_y - 8),
                          (tail_rotor_x - 5, tail_rotor_y + 8), 2)
 
         # Rotor principal
-        rotor_center_x = self.x
-        rotor_center_y = self.y - 15
+        rotor_center_x = x
+        rotor_center_y = y - 15
         for i in range(2):
-            angle = math.radians(self.rotor_angle + i * 180)
+            angle = math.radians(rotor_angle + i * 180)
             end_x = rotor_center_x + math.cos(angle) * 40
             end_y = rotor_center_y + math.sin(angle) * 8
             pygame.draw.line(screen, (80, 80, 80),
@@ -108,196 +252,191 @@ class Helicopter:
                            (int(rotor_center_x), int(rotor_center_y)), 5)
 
         # Patines
-        skid_y = self.y + 12
+        skid_y = y + 12
         pygame.draw.line(screen, (60, 60, 60),
-                         (self.x - 20, skid_y), (self.x + 20, skid_y), 3)
+                         (x - 20, skid_y), (x + 20, skid_y), 3)
         pygame.draw.line(screen, (60, 60, 60),
-                         (self.x - 20, self.y + 5), (self.x - 20, skid_y), 2)
+                         (x - 20, y + 5), (x - 20, skid_y), 2)
         pygame.draw.line(screen, (60, 60, 60),
-                         (self.x + 20, self.y + 5), (self.x + 20, skid_y), 2)
+                         (x + 20, y + 5), (x + 20, skid_y), 2)
         pygame.draw.line(screen, HELICOPTER_ACCENT,
-                         (self.x - 20, self.y), (self.x + 20, self.y), 2)
+                         (x - 20, y), (x + 20, y), 2)
 
-    def draw_health_bar(self, screen):
+    @staticmethod
+    def draw_health_bar_shape(screen, x, y, health, max_health):
         bar_width = 60
         bar_height = 6
-        bar_x = self.x - bar_width // 2
-        bar_y = self.y - 30
+        bar_x = x - bar_width // 2
+        bar_y = y - 30
         pygame.draw.rect(screen, (100, 100, 100),
                          (bar_x, bar_y, bar_width, bar_height))
-        health_width = int((self.health / self.max_health) * bar_width)
-        health_color = (0, 255, 0) if self.health > 50 else (255, 255, 0) if self.health > 25 else (255, 0, 0)
+        health_width = int((health / max_health) * bar_width)
+        health_color = health_bar_color(health)
         pygame.draw.rect(screen, health_color,
                          (bar_x, bar_y, health_width, bar_height))
         pygame.draw.rect(screen, (255, 255, 255),
                          (bar_x, bar_y, bar_width, bar_height), 1)
 
-    def get_rect(self):
-        return pygame.Rect(self.x - 25, self.y - 10, 50, 20)
-
 
 class Bullet:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.speed = 12
-        self.radius = 12
-
-    def update(self):
-        self.x += self.speed
+    """Bala del jugador. Las balas vivas están en un ProjectileBatch (ver projectiles.py)."""
+    SPEED = 12
+    RADIUS = 12
 
-    def draw(self, screen):
+    @staticmethod
+    def draw_shape(screen, x, y, radius):
         pygame.draw.circle(screen, BULLET_COLOR,
-                           (int(self.x), int(self.y)), self.radius)
-
-    def get_rect(self):
-        return pygame.Rect(self.x - self.radius, self.y - self.radius,
-                           self.radius * 2, self.radius * 2)
+                           (int(x), int(y)), radius)
 
 
 class Obstacle:
-    """Pilares desde el suelo (ya no flotan)"""
+    """Pilares desde el suelo (ya no flotan). Quietos en el mundo: x es coordenada de mundo."""
+    __slots__ = ("x", "height", "width")
+    WIDTH = 60
+
     def __init__(self, x, height):
+        self.reset(x, height)
+
+    def reset(self, x, height):
         self.x = x
         self.height = height
-        self.width = 60
-        self.speed = 2.5  # más lento
-
-    def update(self):
-        self.x -= self.speed
-
-    def draw(self, screen):
-        # Posición desde el suelo
-        y_base = SCREEN_HEIGHT - 50
-        y_top = y_base - self.height
+        self.width = self.WIDTH
 
+    @staticmethod
+    def draw_shape(screen, x, y_top, width, height):
         # Bloque principal
         pygame.draw.rect(screen, STONE_GRAY,
-                         (self.x, y_top, self.width, self.height))
+                         (x, y_top, width, height))
 
         # Sombra lateral derecha
         pygame.draw.rect(screen, STONE_DARK,
-                         (self.x + self.width - 5, y_top, 5, self.height))
+                         (x + width - 5, y_top, 5, height))
 
         # Luz lateral izquierda
         pygame.draw.rect(screen, STONE_LIGHT,
-                         (self.x, y_top, 5, self.height))
+                         (x, y_top, 5, height))
 
         # Borde superior
         pygame.draw.rect(screen, (180, 180, 180),
-                         (self.x, y_top, self.width, 4))
+                         (x, y_top, width, 4))
 
-    def get_rect(self):
+    def get_rect(self, camera_x=0):
         y_base = SCREEN_HEIGHT - 50
         y_top = y_base - self.height
-        return pygame.Rect(self.x, y_top, self.width, self.height)
+        return pygame.Rect(self.x - camera_x, y_top, self.width, self.height)
 
 
 class Turret:
+    """Quieta en el mundo (x de mundo); solo recarga y apunta al disparar."""
+    __slots__ = ("x", "y", "width", "height", "health", "shoot_cooldown")
+
     def __init__(self, x, y):
+        self.reset(x, y)
+
+    def reset(self, x, y):
         self.x = x
         self.y = y
         self.width = 40
         self.height = 40
-        self.speed = 2.5
         self.health = 3
         self.shoot_cooldown = 0
-        self.angle = 0
 
-    def update(self, helicopter_x, helicopter_y):
-        self.x -= self.speed
-        dx = helicopter_x - self.x
-        dy = helicopter_y - self.y
-        self.angle = math.atan2(dy, dx)
+    def update(self):
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
 
+    def aim(self, helicopter_x, helicopter_y, camera_x=0):
+        """Ángulo hacia el helicóptero (en coordenadas de pantalla); solo al disparar o dibujar."""
+        return math.atan2(helicopter_y - self.y, helicopter_x - (self.x - camera_x))
+
     def can_shoot(self):
         return self.shoot_cooldown == 0
 
-    def shoot(self):
-        self.shoot_cooldown = 70
-        spawn_x = self.x + math.cos(self.angle) * 20
-        spawn_y = self.y + math.sin(self.angle) * 20
-        return EnemyBullet(spawn_x, spawn_y, self.angle)
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, ENEMY_RED, (int(self.x), int(self.y)), 15)
+    def shoot(self, helicopter_x, helicopter_y, camera_x=0, cooldown=TURRET_COOLDOWN):
+        """Reinicia el cooldown y devuelve (x, y, ángulo) en pantalla de la bala a disparar."""
+        self.shoot_cooldown = cooldown
+        angle = self.aim(helicopter_x, helicopter_y, camera_x)
+        spawn_x = self.x - camera_x + math.cos(angle) * 20
+        spawn_y = self.y + math.sin(angle) * 20
+        return spawn_x, spawn_y, angle
+
+    @staticmethod
+    def draw_shape(screen, x, y, angle):
+        pygame.draw.circle(screen, ENEMY_RED, (int(x), int(y)), 15)
         barrel_length = 25
-        barrel_end_x = self.x + math.cos(self.angle) * barrel_length
-        barrel_end_y = self.y + math.sin(self.angle) * barrel_length
+        barrel_end_x = x + math.cos(angle) * barrel_length
+        barrel_end_y = y + math.sin(angle) * barrel_length
         pygame.draw.line(screen, (150, 150, 150),
-                         (self.x, self.y), (barrel_end_x, barrel_end_y), 4)
-        for i in range(self.health):
+                         (x, y), (barrel_end_x, barrel_end_y), 4)
+
+    @staticmethod
+    def draw_health_pips(screen, x, y, health):
+        for i in range(health):
             pygame.draw.circle(screen, (0, 255, 0),
-                               (int(self.x - 10 + i * 10), int(self.y - 25)), 3)
+                               (int(x - 10 + i * 10), int(y - 25)), 3)
 
-    def get_rect(self):
-        return pygame.Rect(self.x - 20, self.y - 15, 40, 35)
+    def get_rect(self, camera_x=0):
+        return pygame.Rect(self.x - camera_x - 20, self.y - 15, 40, 35)
 
 
 class EnemyBullet:
-    def __init__(self, x, y, angle):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.speed = 6.5  # más lento para mayor equilibrio
-        self.radius = 5
+    """Bala de torreta. Las balas vivas están en un ProjectileBatch (ver projectiles.py)."""
+    RADIUS = 5
 
-    def update(self):
-        self.x += math.cos(self.angle) * self.speed
-        self.y += math.sin(self.angle) * self.speed
+    @staticmethod
+    def draw_shape(screen, x, y, radius):
+        pygame.draw.circle(screen, ENEMY_RED, (int(x), int(y)), radius)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, ENEMY_RED, (int(self.x), int(self.y)), self.radius)
 
-    def get_rect(self):
-        return pygame.Rect(self.x - self.radius, self.y - self.radius,
-                           self.radius * 2, self.radius * 2)
+class Coin:
+    """Quieta en el mundo; el balanceo sale de la edad en ticks, sin actualizar cada frame."""
+    __slots__ = ("x", "y", "radius", "spawn_tick")
+    RADIUS = 12
 
+    def __init__(self, x, y, spawn_tick=0):
+        self.reset(x, y, spawn_tick)
 
-class Coin:
-    def __init__(self, x, y):
+    def reset(self, x, y, spawn_tick=0):
         self.x = x
         self.y = y
-        self.radius = 12
-        self.speed = 2.5
-        self.angle = 0
-        self.bob_offset = 0
+        self.radius = self.RADIUS
+        self.spawn_tick = spawn_tick
 
-    def update(self):
-        self.x -= self.speed
-        self.angle += 5
-        self.bob_offset = math.sin(self.angle * 0.1) * 5
+    def bob_offset(self, tick):
+        # Gira 5 grados por tick desde que aparece
+        angle = (tick - self.spawn_tick) * 5
+        return math.sin(angle * 0.1) * 5
 
-    def draw(self, screen):
-        y = self.y + self.bob_offset
-        pygame.draw.circle(screen, COIN_GOLD, (int(self.x), int(y)), self.radius)
+    @staticmethod
+    def draw_shape(screen, x, y, radius):
+        pygame.draw.circle(screen, COIN_GOLD, (int(x), int(y)), radius)
         pygame.draw.circle(screen, (255, 235, 100),
-                           (int(self.x), int(y)), self.radius - 3)
+                           (int(x), int(y)), radius - 3)
         pygame.draw.circle(screen, (200, 170, 0),
-                           (int(self.x), int(y)), self.radius, 2)
+                           (int(x), int(y)), radius, 2)
 
-    def get_rect(self):
-        y = self.y + self.bob_offset
-        return pygame.Rect(self.x - self.radius, y - self.radius,
-                           self.radius * 2, self.radius * 2)
 
 class Medikit:
+    """En coordenadas de mundo, pero con movimiento propio: va un poco más rápido que el scroll."""
+    __slots__ = ("x", "y", "px", "radius", "heal_amount", "index")
+
     def __init__(self, x, y, heal_amount=20):
+        self.reset(x, y, heal_amount)
+
+    def reset(self, x, y, heal_amount=20):
         self.x = x
+        self.px = x
         self.y = y
         self.radius = 20
         self.heal_amount = heal_amount
 
     def update(self):
-        self.x -= 3  # se mueve hacia la izquierda
+        self.px = self.x
+        self.x -= 3 - SCROLL_SPEED  # en pantalla se mueve 3 px por tick hacia la izquierda
 
-    def draw(self, screen):
+    @staticmethod
+    def draw_shape(screen, x, y, radius):
         # Círculo rojo con cruz blanca
-        pygame.draw.circle(screen, (255, 0, 0), (int(self.x), int(self.y)), self.radius)
-        pygame.draw.line(screen, (255, 255, 255), (self.x - 8, self.y), (self.x + 8, self.y), 3)
-        pygame.draw.line(screen, (255, 255, 255), (self.x, self.y - 8), (self.x, self.y + 8), 3)
-
-    def get_rect(self):
-        return pygame.Rect(self.x - self.radius, self.y - self.radius, self.radius*2, self.radius*2)
+        pygame.draw.circle(screen, (255, 0, 0), (int(x), int(y)), radius)
+        pygame.draw.line(screen, (255, 255, 255), (x - 8, y), (x + 8, y), 3)
+        pygame.draw.line(screen, (255, 255, 255), (x, y - 8), (x, y + 8), 3)
@@ -0,0 +1,398 @@
+"""
+Entorno estilo Gym para entrenar y evaluar pilotos automáticos.
+
+HelicopterEnv envuelve un Game headless:
+    obs, info = env.reset(seed)
+    obs, reward, terminated, truncated, info = env.step(acción)
+La acción es la máscara de entrada de un tick (ver controls.py, sin PAUSE)
+y la observación, un vector float32 de tamaño fijo OBS_SIZE:
+    helicóptero   x, y, velocidad x, velocidad y, salud, recarga del disparo
+    obstáculos    MAX_OBSTACLES más próximos por delante: presente, dx, altura
+    torretas      MAX_TURRETS: presente, dx, dy, salud, recarga
+    balas enemigas MAX_ENEMY_BULLETS más cercanas: presente, dx, dy, vx, vy
+    monedas       MAX_COINS por delante: presente, dx, dy
+Las distancias son relativas al helicóptero y normalizadas por el tamaño de
+la pantalla; los huecos sin entidad quedan en cero. OBS_LAYOUT da el tramo
+de cada grupo.
+
+VectorEnv corre N entornos repartidos en procesos; observaciones, acciones
+y recompensas viajan por memoria compartida, por los pipes solo pasan
+comandos cortos y los resultados de las partidas terminadas.
+
+Uso (benchmark con acciones al azar):
+    python env.py --envs 8 --workers 4 --steps 20000
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import multiprocessing as mp
+import random
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from controls import PAUSE
+from entities import Obstacle
+from display import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Acciones posibles: todas las máscaras de UP, DOWN, LEFT, RIGHT y SHOOT
+NUM_ACTIONS = PAUSE
+
+MAX_OBSTACLES = 4
+MAX_TURRETS = 3
+MAX_ENEMY_BULLETS = 8
+MAX_COINS = 4
+
+HELICOPTER_FEATURES = 6
+OBSTACLE_FEATURES = 3
+TURRET_FEATURES = 5
+ENEMY_BULLET_FEATURES = 5
+COIN_FEATURES = 3
+
+
+def _layout():
+    layout = {}
+    pos = 0
+    for name, size in (("helicopter", HELICOPTER_FEATURES),
+                       ("obstacles", MAX_OBSTACLES * OBSTACLE_FEATURES),
+                       ("turrets", MAX_TURRETS * TURRET_FEATURES),
+                       ("enemy_bullets", MAX_ENEMY_BULLETS * ENEMY_BULLET_FEATURES),
+                       ("coins", MAX_COINS * COIN_FEATURES)):
+        layout[name] = slice(pos, pos + size)
+        pos += size
+    return layout, pos
+
+
+OBS_LAYOUT, OBS_SIZE = _layout()
+
+# Margen detrás del helicóptero en el que un obstáculo todavía cuenta
+BEHIND = Obstacle.WIDTH + 50
+# Castigo al perder, además de la recompensa por score
+DEATH_PENALTY = 100.0
+# Ticks máximos por episodio (el modo infinito no tiene final propio)
+MAX_EPISODE_STEPS = 100_000
+
+
+class HelicopterEnv:
+    """
+    Un entorno: una partida headless reutilizada entre episodios.
+    - reward: aumento del score en el paso; al perder, -DEATH_PENALTY.
+    - terminated: el helicóptero se destruyó o llegó a la meta.
+    - truncated: se alcanzó max_steps.
+    - frame_skip: ticks que se repite cada acción.
+    `out` permite escribir la observación en un arreglo ya reservado (por
+    ejemplo, una fila de memoria compartida); step() y reset() devuelven
+    siempre ese mismo arreglo.
+    """
+
+    def __init__(self, infinite=False, max_steps=MAX_EPISODE_STEPS, frame_skip=1,
+                 resources=None, out=None):
+        # Import diferido: quien solo necesita las constantes no carga el juego
+        from game import Game
+        self.infinite = infinite
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.obs = out if out is not None else np.zeros(OBS_SIZE, dtype=np.float32)
+        self.seed_rng = random.Random()
+        self.game = Game("Agente", headless=True, seed=0, infinite=infinite, resources=resources)
+        self.game.recorder = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Empieza un episodio. Sin seed, la semilla sale del RNG del entorno."""
+        if seed is not None:
+            self.seed_rng.seed(seed)
+        else:
+            seed = self.seed_rng.getrandbits(63)
+        game = self.game
+        game.reset(seed=seed, infinite=self.infinite)
+        # Las partidas del entorno no se graban
+        game.recorder = None
+        self.steps = 0
+        return self.observe(), self.info()
+
+    def step(self, action):
+        game = self.game
+        score = game.score
+        mask = int(action) & ~PAUSE
+        for _ in range(self.frame_skip):
+            game.tick(mask)
+            if game.game_over or game.won:
+                break
+        self.steps += 1
+
+        reward = float(game.score - score)
+        if game.game_over:
+            reward -= DEATH_PENALTY
+        terminated = game.game_over or game.won
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def info(self):
+        game = self.game
+        return {
+            "seed": game.seed,
+            "steps": self.steps,
+            "score": game.score,
+            "distance": game.distance,
+            "health": game.helicopter.health,
+            "won": game.won,
+        }
+
+    def observe(self):
+        """Llena self.obs con el estado actual y lo devuelve."""
+        game = self.game
+        heli = game.helicopter
+        hx, hy = heli.x, heli.y
+        camera_x = game.camera_x
+        # Posición del helicóptero en coordenadas de mundo
+        wx = hx + camera_x
+
+        values = [hx / SCREEN_WIDTH, hy / SCREEN_HEIGHT,
+                  heli.velocity_x / 5, heli.velocity_y / 7,
+                  heli.health / heli.max_health, game.shoot_cooldown / 15]
+
+        # Obstáculos, torretas y monedas: los primeros por delante, en orden de x
+        ahead = camera_x + SCREEN_WIDTH + Obstacle.WIDTH
+        for obstacle in game.obstacles.range(wx - BEHIND, ahead)[:MAX_OBSTACLES]:
+            values += (1.0, (obstacle.x - wx) / SCREEN_WIDTH, obstacle.height / SCREEN_HEIGHT)
+        values += (0.0,) * (OBS_LAYOUT["obstacles"].stop - len(values))
+
+        cooldown = game.tuning.turret_cooldown
+        for turret in game.turrets.range(wx - BEHIND, ahead)[:MAX_TURRETS]:
+            values += (1.0, (turret.x - wx) / SCREEN_WIDTH, (turret.y - hy) / SCREEN_HEIGHT,
+                       turret.health / 3, turret.shoot_cooldown / cooldown)
+        values += (0.0,) * (OBS_LAYOUT["turrets"].stop - len(values))
+
+        # Balas enemigas (en coordenadas de pantalla): las más cercanas
+        bullets = game.enemy_bullets
+        n = len(bullets)
+        if n:
+            rows = np.empty((n, ENEMY_BULLET_FEATURES))
+            rows[:, 0] = 1.0
+            rows[:, 1:3] = (bullets.positions() - (hx, hy)) / (SCREEN_WIDTH, SCREEN_HEIGHT)
+            rows[:, 3:5] = bullets.velocities() / game.tuning.enemy_bullet_speed
+            if n > MAX_ENEMY_BULLETS:
+                distance = np.einsum("ij,ij->i", rows[:, 1:3], rows[:, 1:3])
+                rows = rows[np.argsort(distance, kind="stable")[:MAX_ENEMY_BULLETS]]
+            values += rows.ravel().tolist()
+        values += (0.0,) * (OBS_LAYOUT["enemy_bullets"].stop - len(values))
+
+        tick = game.ticks
+        for coin in game.coins.range(wx - BEHIND, ahead)[:MAX_COINS]:
+            values += (1.0, (coin.x - wx) / SCREEN_WIDTH,
+                       (coin.y + coin.bob_offset(tick) - hy) / SCREEN_HEIGHT)
+        values += (0.0,) * (OBS_SIZE - len(values))
+
+        self.obs[:] = values
+        return self.obs
+
+    def close(self):
+        self.game.close()
+
+
+# ---------------------------------------
+# VARIOS ENTORNOS EN PARALELO
+# ---------------------------------------
+class _SharedArray:
+    """Arreglo NumPy sobre un bloque de memoria compartida, creado o abierto por nombre."""
+
+    def __init__(self, shape, dtype, name=None):
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        self.shape = shape
+        self.dtype = dtype
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+
+    def spec(self):
+        return self.shape, self.dtype, self.shm.name
+
+    def close(self, unlink=False):
+        self.array = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _worker(conn, first, count, specs, env_kwargs):
+    """Proceso de trabajo: corre los entornos [first, first + count) sobre la memoria compartida."""
+    from resources import Resources
+    buffers = {key: _SharedArray(*spec) for key, spec in specs.items()}
+    obs = buffers["obs"].array
+    actions = buffers["actions"].array
+    rewards = buffers["rewards"].array
+    terminated = buffers["terminated"].array
+    truncated = buffers["truncated"].array
+
+    resources = Resources(headless=True)
+    envs = [HelicopterEnv(resources=resources, out=obs[first + i], **env_kwargs)
+            for i in range(count)]
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "step":
+                finished = []
+                for i, env in enumerate(envs, first):
+                    _, reward, term, trunc, info = env.step(actions[i])
+                    rewards[i] = reward
+                    terminated[i] = term
+                    truncated[i] = trunc
+                    if term or trunc:
+                        # Reinicio automático; la fila queda con la observación nueva
+                        info["env"] = i
+                        finished.append(info)
+                        env.reset()
+                conn.send(finished)
+            elif command == "reset":
+                for i, env in enumerate(envs, first):
+                    env.reset(None if arg is None else arg + i)
+                rewards[first:first + count] = 0
+                terminated[first:first + count] = False
+                truncated[first:first + count] = False
+                conn.send(None)
+            elif command == "close":
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for env in envs:
+            env.close()
+        # Sin vistas vivas del bloque, para poder cerrarlo
+        del envs, obs, actions, rewards, terminated, truncated
+        for buffer in buffers.values():
+            buffer.close()
+        conn.close()
+
+
+class VectorEnv:
+    """
+    num_envs entornos repartidos en num_workers procesos (por defecto, uno
+    por núcleo). step() recibe un arreglo de acciones y devuelve
+    (obs, rewards, terminated, truncated, infos):
+    - obs tiene forma (num_envs, OBS_SIZE) y vive en memoria compartida: se
+      sobrescribe en el próximo paso (copiarlo si hay que guardarlo).
+    - Un entorno que termina se reinicia solo; su fila ya trae la
+      observación del episodio nuevo e infos lista el resultado del que
+      terminó (con su índice en "env").
+    """
+
+    def __init__(self, num_envs, num_workers=None, **env_kwargs):
+        self.num_envs = num_envs
+        num_workers = max(1, min(num_envs, num_workers or os.cpu_count() or 1))
+        self._buffers = {
+            "obs": _SharedArray((num_envs, OBS_SIZE), np.float32),
+            "actions": _SharedArray((num_envs,), np.int32),
+            "rewards": _SharedArray((num_envs,), np.float32),
+            "terminated": _SharedArray((num_envs,), np.bool_),
+            "truncated": _SharedArray((num_envs,), np.bool_),
+        }
+        self.observations = self._buffers["obs"].array
+        self.actions = self._buffers["actions"].array
+        self.rewards = self._buffers["rewards"].array
+        self.terminated = self._buffers["terminated"].array
+        self.truncated = self._buffers["truncated"].array
+        specs = {key: buffer.spec() for key, buffer in self._buffers.items()}
+
+        # "spawn": los procesos no heredan el estado de pygame del padre
+        ctx = mp.get_context("spawn")
+        self._conns = []
+        self._workers = []
+        base, extra = divmod(num_envs, num_workers)
+        first = 0
+        for w in range(num_workers):
+            count = base + (w < extra)
+            parent, child = ctx.Pipe()
+            worker = ctx.Process(target=_worker, args=(child, first, count, specs, env_kwargs),
+                                 name=f"env-worker-{w}", daemon=True)
+            worker.start()
+            child.close()
+            self._conns.append(parent)
+            self._workers.append(worker)
+            first += count
+        self.closed = False
+
+    def reset(self, seed=None):
+        """Reinicia todos los entornos; con seed, el entorno i usa seed + i."""
+        for conn in self._conns:
+            conn.send(("reset", seed))
+        for conn in self._conns:
+            conn.recv()
+        return self.observations
+
+    def step(self, actions):
+        self.actions[:] = actions
+        for conn in self._conns:
+            conn.send(("step", None))
+        infos = []
+        for conn in self._conns:
+            infos.extend(conn.recv())
+        return self.observations, self.rewards, self.terminated, self.truncated, infos
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for conn in self._conns:
+            conn.close()
+        self.observations = self.actions = self.rewards = None
+        self.terminated = self.truncated = None
+        for buffer in self._buffers.values():
+            buffer.close(unlink=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del entorno de Helicopter Shooter")
+    parser.add_argument("--envs", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--steps", type=int, default=20000, help="pasos totales (sumando entornos)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    env = HelicopterEnv()
+    env.reset(args.seed)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        _, _, terminated, truncated, _ = env.step(rng.integers(NUM_ACTIONS))
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    print(f"1 entorno:   {args.steps / elapsed:10.0f} pasos/s")
+
+    with VectorEnv(args.envs, args.workers) as venv:
+        venv.reset(args.seed)
+        batches = max(1, args.steps // args.envs)
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(batches):
+            _, _, _, _, infos = venv.step(rng.integers(NUM_ACTIONS, size=args.envs))
+            episodes += len(infos)
+        elapsed = time.perf_counter() - start
+        workers = len(venv._workers)
+    print(f"{args.envs} entornos ({workers} procesos): {batches * args.envs / elapsed:10.0f} pasos/s, "
+          f"{episodes} episodios terminados")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,28 +1,100 @@
 import pygame
+import copy
+import math
 import random
-from entities import Helicopter, Bullet, Obstacle, Turret, EnemyBullet, Coin, Medikit
-from effects import ParticleSystem, SoundManager
-from records import save_record
+import time
+import uuid
+import numpy as np
+from entities import (Helicopter, Bullet, Obstacle, Turret, EnemyBullet, Coin, Medikit,
+                      EntityList, SortedEntityList, lerp, SCROLL_SPEED)
+from effects import ParticleSystem
+from projectiles import ProjectileBatch
+from records import default_service
+from background import Background
+from resources import Resources
+from controls import KeyState, mask_from_keys, SHOOT, PAUSE
+from level import LevelGenerator, LevelStream, OBSTACLE, TURRET, COIN, MEDIKIT
+from replay import ReplayRecorder
+from tuning import Tuning
+from display import SCREEN_WIDTH, SCREEN_HEIGHT
 
-SCREEN_WIDTH = 1200
-SCREEN_HEIGHT = 700
 FPS = 60
 
-SKY_BLUE = (135, 206, 250)
-DARK_BLUE = (25, 25, 112)
-GROUND_GREEN = (34, 139, 34)
-DARK_GREEN = (0, 100, 0)
-CLOUD_WHITE = (255, 255, 255, 200)
+# Paso fijo de simulación: toda la física está en píxeles por tick a 60 Hz
+TICK_RATE = 60
+TICK_DT = 1.0 / TICK_RATE
+# Máximo de ticks por frame dibujado; con más atraso el juego se ralentiza
+MAX_FRAME_SKIP = 5
 
 
 class Game:
-    def __init__(self, player_name="Jugador"):
-        self.player_name = player_name
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Helicopter Shooter")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+    def __init__(self, player_name="Jugador", headless=False, seed=None, records=None,
+                 infinite=False, resources=None, tuning=None):
+        """
+        headless=True simula sin ventana ni sonido: dibuja (si se pide) en una
+        superficie fuera de pantalla. Con la misma semilla y la misma secuencia
+        de entradas el resultado es siempre el mismo.
+        records: RecordsService donde guardar el resultado; por defecto el
+        compartido, salvo en headless, donde no se guarda nada.
+        infinite=True: sin distancia objetivo; el nivel sale de tramos generados
+        por adelantado (ver level.py).
+        resources: Resources compartidos (pantalla, fuentes, sonidos, sprites);
+        si no se pasan se crean aquí.
+        tuning: parámetros de dificultad (ver tuning.py); por defecto, los
+        del juego. Las repeticiones asumen los valores por defecto.
+        """
+        self.headless = headless
+        self.tuning = tuning if tuning is not None else Tuning()
+        self.resources = resources if resources is not None else Resources(headless)
+        self.screen = self.resources.screen
+        self.display = self.resources.display
+        self.clock = self.resources.clock
+        self.font = self.resources.font
+        self.small_font = self.resources.small_font
+        self.hud = self.resources.hud
+        self.profiler = self.resources.profiler
+        self.quality = self.resources.quality
+        self.atlas = self.resources.atlas
+        self.shoot_sound = self.resources.shoot_sound
+        self.explosion_sound = self.resources.explosion_sound
+        self.coin_sound = self.resources.coin_sound
+
+        # Récords: cada partida entrega su resultado una sola vez
+        self.records = records if records is not None or headless else default_service()
+
+        # Contenedores con pool propio; los quietos en el mundo, ordenados por x.
+        # Se vacían al reiniciar, así las instancias se reutilizan entre partidas.
+        self.obstacles = SortedEntityList(Obstacle)
+        self.turrets = SortedEntityList(Turret)
+        self.coins = SortedEntityList(Coin)
+        self.medikits = EntityList(Medikit)
+        self.particle_system = ParticleSystem()
+        # Balas en arreglos NumPy: se mueven, descartan y chocan por lotes
+        self.bullets = ProjectileBatch(Bullet.RADIUS)
+        self.enemy_bullets = ProjectileBatch(EnemyBullet.RADIUS)
+
+        # Fondo pre-renderizado (cielo, nubes y suelo)
+        self.background = Background(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.apply_quality()
+
+        self.level = None
+        self.reset(player_name, seed, infinite)
+
+    def reset(self, player_name=None, seed=None, infinite=None):
+        """
+        Empieza una partida nueva reutilizando recursos, contenedores y pools;
+        solo se reinicia el estado de juego. player_name e infinite se
+        mantienen si no se indican; sin seed se elige una al azar.
+        """
+        self.close()
+        if player_name is not None:
+            self.player_name = player_name
+        if infinite is not None:
+            self.infinite = infinite
+        # Toda partida tiene semilla, así se puede grabar y repetir
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
 
         self.running = True
         self.game_over = False
@@ -32,296 +104,515 @@ class Game:
         # Score y distancia
         self.distance = 0
         self.score = 0
-        self.target_distance = 4000  # después puedes hacerlo infinito
+        self.target_distance = None if self.infinite else 4000
+        self.run_id = uuid.uuid4().hex
 
         # Jugador y objetos
         self.helicopter = Helicopter(200, SCREEN_HEIGHT // 2)
-        self.bullets = []
-        self.obstacles = []
-        self.turrets = []
-        self.enemy_bullets = []
-        self.coins = []
-        self.medikits = []
-
-        self.particle_system = ParticleSystem()
-
-        # sonidos
-        try:
-            self.shoot_sound = SoundManager.generate_shoot_sound()
-            self.explosion_sound = SoundManager.generate_explosion_sound()
-            self.coin_sound = SoundManager.generate_coin_sound()
-        except Exception:
-            self.shoot_sound = None
-            self.explosion_sound = None
-            self.coin_sound = None
-
+        # Helicóptero y balas viven en coordenadas de pantalla (se mueven
+        # solos); obstáculos, torretas, monedas y medikits, en coordenadas de
+        # mundo: el scroll es solo el avance de la cámara.
+        self.camera_x = 0
+        self.prev_camera_x = 0
+        self.ticks = 0
+        for container in (self.bullets, self.obstacles, self.turrets,
+                          self.enemy_bullets, self.coins, self.medikits):
+            container.clear()
+
+        # Un único RNG para la simulación; los efectos visuales usan RNGs
+        # derivados para que dibujar o no dibujar no altere la partida
+        self.rng = random.Random(seed)
+        self.particle_system.clear()
+        self.particle_system.rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        self.pending_actions = 0
         self.shoot_cooldown = 0
         self.spawn_timer = 0
-        self.background_offset = 0
 
-        # Nubes
-        self.clouds = [
-            [random.randint(0, SCREEN_WIDTH), random.randint(50, 200),
-             random.randint(100, 180), random.randint(50, 80),
-             random.uniform(0.3, 1.0)]
-            for _ in range(6)
-        ]
+        self.background.reset(random.Random(self.rng.getrandbits(64)))
+
+        # Modo infinito: tramos con semilla propia derivada de la partida
+        self.level_seed = None
+        self.chunk = None
+        self.chunk_pos = 0
+        if self.infinite:
+            self.level_seed = self.rng.getrandbits(32)
+            self.level = LevelStream(self.level_seed)
+            self.chunk = self.level.next_chunk()
+
+        # Grabación de las entradas de cada tick (ver replay.py)
+        self.recorder = ReplayRecorder(seed, self.player_name, self.infinite)
 
     # ---------------------------------------
     # BACKGROUND
     # ---------------------------------------
-    def draw_background(self):
-        for y in range(SCREEN_HEIGHT - 50):
-            ratio = y / (SCREEN_HEIGHT - 50)
-            color = (
-                int(SKY_BLUE[0] + (DARK_BLUE[0] - SKY_BLUE[0]) * ratio),
-                int(SKY_BLUE[1] + (DARK_BLUE[1] - SKY_BLUE[1]) * ratio),
-                int(SKY_BLUE[2] + (DARK_BLUE[2] - SKY_BLUE[2]) * ratio)
-            )
-            pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
-
-        for cloud in self.clouds:
-            x, y, w, h, speed = cloud
-            surf = pygame.Surface((w, h), pygame.SRCALPHA)
-            pygame.draw.ellipse(surf, CLOUD_WHITE, (0, 0, w, h))
-            self.screen.blit(surf, (x, y))
-            cloud[0] -= speed
-            if cloud[0] < -w:
-                cloud[0] = SCREEN_WIDTH + random.randint(0, 200)
-                cloud[1] = random.randint(40, 220)
-
-        # Suelo
-        pygame.draw.rect(self.screen, GROUND_GREEN, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50))
-        for i in range(0, SCREEN_WIDTH, 100):
-            pygame.draw.rect(self.screen, DARK_GREEN,
-                             ((i - int(self.background_offset * 2)) % SCREEN_WIDTH,
-                              SCREEN_HEIGHT - 50, 50, 50))
+    def camera_at(self, alpha=1.0):
+        """Posición de la cámara interpolada entre el tick anterior y el actual."""
+        return lerp(self.prev_camera_x, self.camera_x, alpha)
+
+    def background_blits(self, alpha=1.0):
+        return self.background.blit_sequence(self.screen, self.camera_at(alpha))
 
     # ---------------------------------------
     # SPAWN OBJECTS
     # ---------------------------------------
     def spawn_objects(self):
+        tuning = self.tuning
         self.spawn_timer += 1
-        if self.spawn_timer > 70:
+        if self.spawn_timer > tuning.spawn_interval:
             self.spawn_timer = 0
-            if random.random() < 0.35:
-                self.obstacles.append(Obstacle(SCREEN_WIDTH, random.randint(70, 180)))
-            if random.random() < 0.15:
-                self.turrets.append(Turret(SCREEN_WIDTH, random.randint(150, SCREEN_HEIGHT - 180)))
-            if random.random() < 0.45:
-                self.coins.append(Coin(SCREEN_WIDTH, random.randint(100, SCREEN_HEIGHT - 200)))
-            if random.random() < 0.05:
-                self.medikits.append(Medikit(SCREEN_WIDTH, random.randint(100, SCREEN_HEIGHT - 150)))
+            # Todo aparece en el borde derecho de la pantalla
+            x = self.camera_x + SCREEN_WIDTH
+            if self.rng.random() < tuning.obstacle_chance:
+                self.obstacles.spawn(x, self.rng.randint(70, 180))
+            if self.rng.random() < tuning.turret_chance:
+                self.turrets.spawn(x, self.rng.randint(150, SCREEN_HEIGHT - 180))
+            if self.rng.random() < tuning.coin_chance:
+                self.coins.spawn(x, self.rng.randint(100, SCREEN_HEIGHT - 200), self.ticks)
+            if self.rng.random() < tuning.medikit_chance:
+                self.medikits.spawn(x, self.rng.randint(100, SCREEN_HEIGHT - 150))
+
+    def stream_objects(self):
+        """Modo infinito: crea lo que los tramos tienen hasta el borde derecho de la pantalla."""
+        edge = self.camera_x + SCREEN_WIDTH
+        chunk = self.chunk
+        while True:
+            spawns = chunk.spawns
+            while self.chunk_pos < len(spawns) and spawns[self.chunk_pos][0] <= edge:
+                x, kind, value = spawns[self.chunk_pos]
+                self.chunk_pos += 1
+                if kind == OBSTACLE:
+                    self.obstacles.spawn(x, value)
+                elif kind == TURRET:
+                    self.turrets.spawn(x, value)
+                elif kind == COIN:
+                    self.coins.spawn(x, value, self.ticks)
+                elif kind == MEDIKIT:
+                    self.medikits.spawn(x, value)
+            if self.chunk_pos < len(spawns) or chunk.end > edge:
+                break
+            # Tramo terminado: se suelta y se toma el siguiente de la cola
+            chunk = self.chunk = self.level.next_chunk()
+            self.chunk_pos = 0
+
+    def close(self):
+        """Libera lo que la partida tiene corriendo en segundo plano."""
+        if self.level is not None:
+            self.level.close()
+            self.level = None
 
     # ---------------------------------------
     # INPUT
     # ---------------------------------------
     def handle_input(self):
+        """Lee los eventos de la ventana; disparo y pausa se aplican en el próximo tick."""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 if self.game_over or self.won:
-                    save_record(self.player_name, self.score, self.distance)
+                    self.submit_record()
                 self.running = False
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
-                    self.paused = not self.paused
+                    self.pending_actions |= PAUSE
+
+                # Profiler: F3 muestra/oculta la capa, F4 exporta trace y CSV
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                elif event.key == pygame.K_F4 and self.profiler.frames:
+                    try:
+                        self.profiler.export()
+                    except OSError as e:
+                        # Sin permiso o sin espacio: se avisa y el juego sigue
+                        print(f"No se pudo exportar el perfil: {e}")
 
                 if not self.paused:
-                    if event.key == pygame.K_SPACE and self.shoot_cooldown == 0 and not (self.game_over or self.won):
-                        self.bullets.append(Bullet(self.helicopter.x + 30, self.helicopter.y))
-                        if self.shoot_sound:
-                            try:
-                                self.shoot_sound.play()
-                            except Exception:
-                                pass
-                        self.shoot_cooldown = 15
+                    if event.key == pygame.K_SPACE:
+                        self.pending_actions |= SHOOT
 
                     if event.key == pygame.K_r and (self.game_over or self.won):
-                        save_record(self.player_name, self.score, self.distance)
-                        pname = self.player_name
-                        self.__init__(pname)
+                        self.submit_record()
+                        self.reset()
 
                 else:
                     if event.key == pygame.K_r:
-                        save_record(self.player_name, self.score, self.distance)
-                        pname = self.player_name
-                        self.__init__(pname)
+                        self.submit_record()
+                        self.reset()
+
+    def read_input(self):
+        """Máscara de entrada del tick actual a partir del teclado real."""
+        mask = mask_from_keys(pygame.key.get_pressed()) | self.pending_actions
+        self.pending_actions = 0
+        return mask
+
+    def fire(self):
+        if self.shoot_cooldown == 0 and not (self.game_over or self.won):
+            self.bullets.spawn(self.helicopter.x + 30, self.helicopter.y, Bullet.SPEED, 0.0)
+            if self.shoot_sound:
+                try:
+                    self.shoot_sound.play()
+                except Exception:
+                    pass
+            self.shoot_cooldown = 15
+
+    # ---------------------------------------
+    # TICK
+    # ---------------------------------------
+    def tick(self, mask):
+        """Avanza la simulación un paso con una máscara de entrada (ver controls.py)."""
+        if self.recorder is not None and not (self.game_over or self.won):
+            self.recorder.record(mask)
+        if mask & PAUSE:
+            self.paused = not self.paused
+        if mask & SHOOT and not self.paused:
+            self.fire()
+        self.update(KeyState(mask))
 
     # ---------------------------------------
     # UPDATE
     # ---------------------------------------
-    def update(self):
+    def update(self, keys=None):
         if self.game_over or self.won or self.paused:
             return
 
-        keys = pygame.key.get_pressed()
-        self.helicopter.update(keys)
+        profiler = self.profiler
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        with profiler.scope("update.helicopter"):
+            self.helicopter.update(keys)
 
         # DISTANCIA + SCORE
         self.distance += 1
         self.score = self.distance // 5  # cada 5 píxeles = 1 punto
 
-        if self.distance >= self.target_distance:
+        if self.target_distance is not None and self.distance >= self.target_distance:
             self.won = True
 
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
 
-        # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.x > SCREEN_WIDTH + 50:
-                self.bullets.remove(bullet)
+        # Avanza la cámara: lo que está quieto en el mundo no se toca
+        self.ticks += 1
+        self.prev_camera_x = self.camera_x
+        self.camera_x += SCROLL_SPEED
+        camera_x = self.camera_x
+
+        # Lo que quedó atrás de la cámara es un prefijo de cada lista ordenada
+        with profiler.scope("update.despawn"):
+            self.obstacles.drop_before(camera_x - Obstacle.WIDTH)
+            self.turrets.drop_before(camera_x - 50)
+            self.coins.drop_before(camera_x - Coin.RADIUS)
+
+        # Balas: movimiento y descarte vectorizados
+        with profiler.scope("update.bullets"):
+            self.bullets.step()
+            self.bullets.cull(x_max=SCREEN_WIDTH + 50)
+
+        # Torretas: el ángulo solo se calcula al disparar
+        with profiler.scope("update.turrets"):
+            turrets = self.turrets
+            heli_x, heli_y = self.helicopter.x, self.helicopter.y
+            fire_line = camera_x + SCREEN_WIDTH - 100
+            cooldown = self.tuning.turret_cooldown
+            bullet_speed = self.tuning.enemy_bullet_speed
+            for i in range(len(turrets) - 1, -1, -1):
+                turret = turrets[i]
+                turret.update()
+                if turret.can_shoot() and turret.x < fire_line:
+                    x, y, angle = turret.shoot(heli_x, heli_y, camera_x, cooldown)
+                    self.enemy_bullets.spawn(x, y, math.cos(angle) * bullet_speed,
+                                             math.sin(angle) * bullet_speed)
+
+        with profiler.scope("update.enemy_bullets"):
+            self.enemy_bullets.step()
+            self.enemy_bullets.cull(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT)
+
+        # Se recorre de atrás hacia adelante para poder borrar sin copiar la lista
+        with profiler.scope("update.medikits"):
+            medikits = self.medikits
+            for i in range(len(medikits) - 1, -1, -1):
+                medikit = medikits[i]
+                medikit.update()
+                if medikit.x - camera_x < -medikit.radius:
+                    medikits.remove(medikit)
+
+        with profiler.scope("update.collisions"):
+            self.handle_collisions()
+
+        with profiler.scope("update.particles"):
+            self.particle_system.update()
+        with profiler.scope("update.spawn"):
+            if self.infinite:
+                self.stream_objects()
+            else:
+                self.spawn_objects()
 
-        # Update obstáculos
-        for obstacle in self.obstacles[:]:
-            obstacle.update()
-            if obstacle.x < -obstacle.width:
-                self.obstacles.remove(obstacle)
-            elif self.helicopter.get_rect().colliderect(obstacle.get_rect()):
-                self.helicopter.health -= 20
+        if self.helicopter.health <= 0:
+            self.game_over = True
+            self.particle_system.add_explosion(self.helicopter.x, self.helicopter.y, 30)
+
+        if self.game_over or self.won:
+            with profiler.scope("submit_record"):
+                self.submit_record()
+            self.close()
+
+    def submit_record(self):
+        """Entrega el resultado al servicio de récords (no escribe en disco aquí)."""
+        if self.records is not None:
+            replay = None
+            if self.recorder is not None:
+                replay = self.recorder.finish(self.score, self.distance).to_bytes()
+            self.records.submit(self.run_id, self.player_name, self.score, self.distance, replay)
+
+    # ---------------------------------------
+    # SNAPSHOTS
+    # ---------------------------------------
+    SNAPSHOT_FIELDS = ("distance", "score", "won", "game_over", "paused", "shoot_cooldown",
+                       "spawn_timer", "camera_x", "prev_camera_x", "ticks", "chunk_pos")
+    SNAPSHOT_ENTITIES = ("helicopter", "bullets", "obstacles", "turrets", "enemy_bullets",
+                         "coins", "medikits")
+
+    def snapshot(self):
+        """Estado de la simulación (sin ventana, sonido ni fondo) para saltar dentro de una repetición."""
+        state = {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS}
+        state["entities"] = copy.deepcopy([getattr(self, name) for name in self.SNAPSHOT_ENTITIES])
+        state["rng"] = self.rng.getstate()
+        state["particles"] = self.particle_system.snapshot()
+        state["chunk"] = self.chunk.index if self.chunk is not None else None
+        return state
+
+    def restore(self, state):
+        """Vuelve a un estado tomado con snapshot(); el snapshot se puede reutilizar."""
+        for name in self.SNAPSHOT_FIELDS:
+            setattr(self, name, state[name])
+        for name, value in zip(self.SNAPSHOT_ENTITIES, copy.deepcopy(state["entities"])):
+            setattr(self, name, value)
+        self.rng.setstate(state["rng"])
+        self.particle_system.restore(state["particles"])
+
+        if self.infinite:
+            self.close()
+            index = state["chunk"]
+            self.chunk = LevelGenerator(self.level_seed).chunk(index)
+            if not (self.game_over or self.won):
+                self.level = LevelStream(self.level_seed, start=index + 1)
+
+    # ---------------------------------------
+    # COLLISIONS
+    # ---------------------------------------
+    def handle_collisions(self):
+        """
+        Obstáculos, torretas y monedas se buscan por rango de x en sus listas
+        ordenadas; las balas se prueban por lotes contra el helicóptero y las
+        torretas. Los efectos se aplican en el mismo orden que antes
+        (obstáculos, torretas, balas, monedas, medikits).
+        Contra el helicóptero se compara primero el rect de sus píxeles
+        opacos y, solo si toca, las máscaras de los sprites (ver atlas.py).
+        """
+        atlas = self.atlas
+        heli_mask, (ox, oy), heli_rect = atlas.helicopter_collider(self.helicopter)
+        camera_x = self.camera_x
+        # Rango de x de mundo que toca el helicóptero
+        left = heli_rect.left + camera_x
+        right = heli_rect.right + camera_x
+
+        heli_left, heli_top, heli_right, heli_bottom = (
+            heli_rect.left, heli_rect.top, heli_rect.right, heli_rect.bottom)
+
+        def touches(collider, x, y):
+            """Choque píxel a píxel con un sprite cuyo ancla está en (x, y) de pantalla."""
+            x = int(x)
+            y = int(y)
+            return (x + collider.left < heli_right and x + collider.right > heli_left and
+                    y + collider.top < heli_bottom and y + collider.bottom > heli_top and
+                    heli_mask.overlap(collider.mask, (x - collider.ax - ox, y - collider.ay - oy)) is not None)
+
+        enemy_bullets = self.enemy_bullets
+        bullet_hits = []
+        if enemy_bullets:
+            # El rect de cada bala es algo menor que su sprite: se agranda el del helicóptero
+            bullet_hits = enemy_bullets.hits(heli_rect.inflate(4, 4))
+            if bullet_hits:
+                positions = enemy_bullets.positions()[bullet_hits].tolist()
+                bullet_hits = [j for j, (x, y) in zip(bullet_hits, positions)
+                               if touches(atlas.enemy_bullet_mask, x, y)]
+
+        # Obstáculos
+        for obstacle in self.obstacles.range(left - Obstacle.WIDTH, right):
+            rect = obstacle.get_rect(camera_x)
+            if (heli_rect.colliderect(rect) and
+                    heli_mask.overlap(atlas.obstacle_mask(rect.size), (rect.x - ox, rect.y - oy))):
+                self.helicopter.health -= self.tuning.obstacle_damage
                 self.particle_system.add_explosion(self.helicopter.x, self.helicopter.y, 15)
                 self.obstacles.remove(obstacle)
 
-        # Update turrets
-        for turret in self.turrets[:]:
-            turret.update(self.helicopter.x, self.helicopter.y)
-            if turret.x < -50:
-                self.turrets.remove(turret)
-                continue
-            if turret.can_shoot() and turret.x < SCREEN_WIDTH - 100:
-                self.enemy_bullets.append(turret.shoot())
-            for bullet in self.bullets[:]:
-                if bullet.get_rect().colliderect(turret.get_rect()):
+        # Balas del jugador contra torretas
+        if self.bullets and self.turrets:
+            bullets = self.bullets
+            turrets = self.turrets
+            # Solo las torretas al alcance de alguna bala, de atrás hacia adelante
+            xs = bullets.positions()[:, 0]
+            reach = Bullet.RADIUS + 20
+            order = turrets.range(camera_x + xs.min() - reach, camera_x + xs.max() + reach)[::-1]
+            pairs = bullets.hit_pairs([turret.get_rect(camera_x) for turret in order])
+            if pairs:
+                spent = set()
+                destroyed = set()
+                for t, j in pairs:
+                    if t in destroyed or j in spent:
+                        continue
+                    turret = order[t]
+                    turret_x = turret.x - camera_x
                     turret.health -= 1
-                    self.bullets.remove(bullet)
-                    self.particle_system.add_explosion(turret.x, turret.y, 10)
+                    spent.add(j)
+                    self.particle_system.add_explosion(turret_x, turret.y, 10)
                     if turret.health <= 0:
-                        self.turrets.remove(turret)
                         self.score += 50
-                        self.particle_system.add_explosion(turret.x, turret.y, 20)
-
-        # Update enemy bullets
-        for enemy_bullet in self.enemy_bullets[:]:
-            enemy_bullet.update()
-            if (enemy_bullet.x < 0 or enemy_bullet.x > SCREEN_WIDTH or
-                enemy_bullet.y < 0 or enemy_bullet.y > SCREEN_HEIGHT):
-                self.enemy_bullets.remove(enemy_bullet)
-            elif self.helicopter.get_rect().colliderect(enemy_bullet.get_rect()):
-                self.helicopter.health -= 10
-                self.enemy_bullets.remove(enemy_bullet)
-                self.particle_system.add_explosion(enemy_bullet.x, enemy_bullet.y, 8)
-
-        # Update coins
-        for coin in self.coins[:]:
-            coin.update()
-            if coin.x < -coin.radius:
-                self.coins.remove(coin)
-            elif self.helicopter.get_rect().colliderect(coin.get_rect()):
+                        self.particle_system.add_explosion(turret_x, turret.y, 20)
+                        turrets.remove(turret)
+                        destroyed.add(t)
+                bullets.remove(spent)
+
+        # Balas enemigas
+        if bullet_hits:
+            for x, y in enemy_bullets.positions()[bullet_hits].tolist():
+                self.helicopter.health -= self.tuning.enemy_bullet_damage
+                self.particle_system.add_explosion(x, y, 8)
+            enemy_bullets.remove(bullet_hits)
+
+        # Monedas
+        coin_mask = atlas.coin_mask
+        # Margen: de dónde a dónde llegan los píxeles de la moneda respecto de su centro
+        for coin in self.coins.range(left - coin_mask.right - 1, right - coin_mask.left + 1):
+            if touches(coin_mask, coin.x - camera_x, coin.y + coin.bob_offset(self.ticks)):
                 self.score += 10
+                self.particle_system.add_explosion(coin.x - camera_x, coin.y, 10)
                 self.coins.remove(coin)
-                self.particle_system.add_explosion(coin.x, coin.y, 10)
-
-        # Update medikits
-        for medikit in self.medikits[:]:
-            medikit.update()
-            if medikit.x < -medikit.radius:
-                self.medikits.remove(medikit)
-            elif self.helicopter.get_rect().colliderect(medikit.get_rect()):
-                self.helicopter.health += medikit.heal_amount
-                if self.helicopter.health > self.helicopter.max_health:
-                    self.helicopter.health = self.helicopter.max_health
-                self.medikits.remove(medikit)
-
-        self.particle_system.update()
-        self.spawn_objects()
 
-        if self.helicopter.health <= 0:
-            self.game_over = True
-            self.particle_system.add_explosion(self.helicopter.x, self.helicopter.y, 30)
-
-        self.background_offset = (self.background_offset + 0.5) % SCREEN_WIDTH
+        # Medikits
+        medikit_mask = atlas.medikit_mask
+        medikits = [m for m in self.medikits if touches(medikit_mask, m.x - camera_x, m.y)]
+        for medikit in medikits:
+            self.helicopter.health += medikit.heal_amount
+            if self.helicopter.health > self.helicopter.max_health:
+                self.helicopter.health = self.helicopter.max_health
+            self.medikits.remove(medikit)
 
     # ---------------------------------------
     # DRAW
     # ---------------------------------------
-    def draw(self):
-        # Dibujar todo
-        self.draw_background()
-
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
-        for coin in self.coins:
-            coin.draw(self.screen)
-        for turret in self.turrets:
-            turret.draw(self.screen)
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
-        for enemy_bullet in self.enemy_bullets:
-            enemy_bullet.draw(self.screen)
-        for medikit in self.medikits:
-            medikit.draw(self.screen)
-
-        self.particle_system.draw(self.screen)
-
+    def draw(self, alpha=1.0):
+        """Dibuja el estado interpolado entre el tick anterior (alpha=0) y el actual (alpha=1)."""
+        if self.paused or self.game_over or self.won:
+            alpha = 1.0
+
+        # El mundo se arma como una lista y se dibuja con una sola llamada en
+        # el lienzo (a la escala de render); el HUD va encima, en la ventana
+        profiler = self.profiler
+        with profiler.scope("draw.background"):
+            blits = self.background_blits(alpha)
+        with profiler.scope("draw.entities"):
+            self.atlas.add_entities(blits, self, alpha)
+        with profiler.scope("draw.particles"):
+            blits.extend(self.particle_system.blit_sequence())
         if not self.game_over:
-            self.helicopter.draw(self.screen)
-            self.helicopter.draw_health_bar(self.screen)
+            self.atlas.add_helicopter(blits, self.helicopter, alpha)
+        with profiler.scope("draw.blits"):
+            self.display.draw(blits)
 
-        self.draw_ui()
+        hud = self.hud.stats_blits(self.player_name, self.score,
+                                   self.distance, self.target_distance)
 
         # Pausa
         if self.paused:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            self.screen.blit(overlay, (0, 0))
-            t = self.font.render("PAUSA", True, (255, 255, 255))
-            t2 = self.small_font.render("Presiona P para continuar — R para reiniciar", True, (200, 200, 200))
-            self.screen.blit(t, (SCREEN_WIDTH // 2 - t.get_width() // 2, 280))
-            self.screen.blit(t2, (SCREEN_WIDTH // 2 - t2.get_width() // 2, 340))
+            hud.extend(self.hud.pause_blits())
 
         # Game Over
         if self.game_over:
-            save_record(self.player_name, self.score, self.distance)
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.screen.blit(overlay, (0, 0))
-            self.show_message("GAME OVER", "Presiona R para reiniciar")
+            hud.extend(self.hud.message_blits("GAME OVER", "Presiona R para reiniciar"))
 
         # Ganaste
         if self.won:
-            save_record(self.player_name, self.score, self.distance)
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.screen.blit(overlay, (0, 0))
-            self.show_message("¡GANASTE!", "Presiona R para volver a jugar")
+            hud.extend(self.hud.message_blits("¡GANASTE!", "Presiona R para volver a jugar"))
+
+        hud.extend(profiler.overlay_blits(self.small_font))
+
+        with profiler.scope("draw.present"):
+            self.display.present(hud)
 
-        pygame.display.flip()
+        if not self.headless:
+            with profiler.scope("draw.flip"):
+                pygame.display.flip()
 
     # ---------------------------------------
-    # UI
+    # CALIDAD
     # ---------------------------------------
-    def draw_ui(self):
-        score_text = self.font.render(f"{self.player_name} — Score: {self.score}", True, (255, 255, 255))
-        self.screen.blit(score_text, (20, 20))
-        distance_text = self.small_font.render(f"Distancia: {self.distance}/{self.target_distance}", True, (255, 255, 255))
-        self.screen.blit(distance_text, (20, 55))
-        pause_hint = self.small_font.render("P = Pausa  |  R = Reiniciar cuando pierdas", True, (200, 200, 200))
-        self.screen.blit(pause_hint, (20, SCREEN_HEIGHT - 40))
-
-    def show_message(self, line1, line2):
-        t1 = self.font.render(line1, True, (255, 255, 255))
-        t2 = self.small_font.render(line2, True, (255, 255, 255))
-        self.screen.blit(t1, (SCREEN_WIDTH // 2 - t1.get_width() // 2, 300))
-        self.screen.blit(t2, (SCREEN_WIDTH // 2 - t2.get_width() // 2, 360))
+    def apply_quality(self):
+        """Lleva el nivel del gobernador a partículas, fondo y sprites (nada de esto toca la simulación)."""
+        settings = self.quality.settings
+        self.particle_system.emission = settings["particles"]
+        self.particle_system.limit = settings["particle_cap"]
+        self.background.set_detail(settings["clouds"], settings["animated_clouds"])
+        self.atlas.set_simple(settings["simple_entities"])
+
+    def adapt_quality(self, frame_ms):
+        """Pasa el tiempo de trabajo del frame al gobernador y aplica lo que decida."""
+        decision = self.quality.record(frame_ms)
+        if decision is not None:
+            self.apply_quality()
+            self.profiler.mark("calidad", decision)
+
+    def entity_counts(self):
+        """Cantidad de entidades vivas por tipo y nivel de calidad (para el profiler)."""
+        return {
+            "balas": len(self.bullets),
+            "obstaculos": len(self.obstacles),
+            "torretas": len(self.turrets),
+            "balas_enemigas": len(self.enemy_bullets),
+            "monedas": len(self.coins),
+            "medikits": len(self.medikits),
+            "particulas": len(self.particle_system),
+            "calidad": self.quality.level,
+        }
 
     # ---------------------------------------
     # RUN
     # ---------------------------------------
     def run(self):
+        """
+        Bucle de paso fijo: el tiempo real se acumula y se consume en ticks de
+        TICK_DT. Si un frame tarda, se corren varios ticks antes de dibujar
+        (saltando dibujos) para que la simulación no se retrase; el dibujo
+        interpola entre los dos últimos ticks.
+        """
+        profiler = self.profiler
+        accumulator = 0.0
+        previous = time.perf_counter()
         while self.running:
-            self.handle_input()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            now = time.perf_counter()
+            accumulator += now - previous
+            previous = now
+            profiler.begin_frame()
+
+            with profiler.scope("handle_input"):
+                self.handle_input()
+            steps = 0
+            while accumulator >= TICK_DT and steps < MAX_FRAME_SKIP:
+                with profiler.scope("tick"):
+                    self.tick(self.read_input())
+                accumulator -= TICK_DT
+                steps += 1
+            if steps == MAX_FRAME_SKIP:
+                # Demasiado atraso: se descarta en lugar de acumularlo
+                accumulator = min(accumulator, TICK_DT)
+
+            with profiler.scope("draw"):
+                self.draw(accumulator / TICK_DT)
+            # El gobernador mide el trabajo del frame, sin la espera del reloj
+            self.adapt_quality((time.perf_counter() - now) * 1000)
+            with profiler.scope("idle"):
+                self.clock.tick(FPS)
+            if profiler.enabled:
+                profiler.end_frame(self.entity_counts())
+
+        self.close()
@@ -0,0 +1,181 @@
+"""
+Simulación sin ventana, determinista y sin límite de FPS.
+
+Con la misma semilla y el mismo guion de entradas, score y distancia son
+siempre iguales, así que se pueden simular horas de juego en segundos.
+
+También reproduce y verifica repeticiones grabadas (ver replay.py).
+
+Uso:
+    python headless.py --seed 42 --runs 20
+    python headless.py --replay partida.hsr
+    python headless.py --best Jugador
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import time
+
+import pygame
+from game import Game
+from controls import UP, SHOOT
+from replay import Replay, ReplayError
+
+MAX_TICKS = 100_000
+# Cada cuántos ticks se guarda un snapshot al reproducir (10 s de juego)
+SNAPSHOT_INTERVAL = 600
+
+
+def hover_pilot(tick, game, target_y=250):
+    """Piloto de ejemplo: se mantiene a una altura fija y dispara sin parar."""
+    mask = SHOOT
+    if game.helicopter.y > target_y:
+        mask |= UP
+    return mask
+
+
+def script_input(script):
+    """Convierte una lista de máscaras (una por tick) en un piloto; al acabarse, no pulsa nada."""
+    def pilot(tick, game):
+        return script[tick] if tick < len(script) else 0
+    return pilot
+
+
+def run_headless(seed, script=None, max_ticks=MAX_TICKS, player_name="Headless"):
+    """
+    Juega una partida completa sin ventana.
+    `script` puede ser una lista de máscaras o una función (tick, game) -> máscara.
+    """
+    pilot = script if callable(script) else script_input(script or [])
+    game = Game(player_name, headless=True, seed=seed)
+
+    ticks = 0
+    while not (game.game_over or game.won) and ticks < max_ticks:
+        game.tick(pilot(ticks, game))
+        ticks += 1
+
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "score": game.score,
+        "distance": game.distance,
+        "health": game.helicopter.health,
+        "game_over": game.game_over,
+        "won": game.won,
+    }
+
+
+class ReplayPlayer:
+    """
+    Reproduce una repetición sin ventana y sin límite de FPS.
+    Cada SNAPSHOT_INTERVAL ticks guarda un snapshot del juego, así seek()
+    retoma desde el más cercano en lugar de volver a simular desde el inicio.
+    """
+
+    def __init__(self, replay, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.replay = replay
+        self.masks = list(replay.masks())
+        self.snapshot_interval = snapshot_interval
+        self.game = Game(replay.player_name, headless=True, seed=replay.seed,
+                         infinite=replay.infinite)
+        self.game.recorder = None
+        self.tick = 0
+        self.snapshots = {0: self.game.snapshot()}
+
+    def step(self):
+        self.game.tick(self.masks[self.tick])
+        self.tick += 1
+        if self.tick % self.snapshot_interval == 0 and self.tick not in self.snapshots:
+            self.snapshots[self.tick] = self.game.snapshot()
+
+    def run_to(self, tick):
+        tick = min(tick, len(self.masks))
+        while self.tick < tick:
+            self.step()
+        return self.game
+
+    def seek(self, tick):
+        """Deja el juego en el estado del tick pedido."""
+        tick = max(0, min(tick, len(self.masks)))
+        base = max(t for t in self.snapshots if t <= tick)
+        if tick < self.tick or base > self.tick:
+            self.game.restore(self.snapshots[base])
+            self.tick = base
+        return self.run_to(tick)
+
+    def close(self):
+        self.game.close()
+
+
+def verify_replay(replay):
+    """
+    Reproduce la partida completa y compara con el resultado declarado.
+    Es válida si termina en el último tick grabado con el mismo score y distancia.
+    """
+    player = ReplayPlayer(replay)
+    game = player.run_to(replay.ticks)
+    player.close()
+    finished = game.game_over or game.won
+    return {
+        "seed": replay.seed,
+        "ticks": replay.ticks,
+        "score": game.score,
+        "distance": game.distance,
+        "claimed_score": replay.score,
+        "claimed_distance": replay.distance,
+        "valid": finished and game.score == replay.score and game.distance == replay.distance,
+    }
+
+
+def print_verification(replay):
+    start = time.perf_counter()
+    result = verify_replay(replay)
+    elapsed = time.perf_counter() - start
+    status = "VÁLIDA" if result["valid"] else "INVÁLIDA"
+    print(f"{status}: {replay.player_name} score={result['score']} (declarado {result['claimed_score']}) "
+          f"distancia={result['distance']} (declarada {result['claimed_distance']}) "
+          f"{result['ticks']} ticks en {elapsed:.3f}s")
+    return result["valid"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación headless de Helicopter Shooter")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--replay", help="verifica una repetición guardada en un archivo")
+    parser.add_argument("--best", metavar="NOMBRE", help="verifica la mejor partida guardada de un jugador")
+    args = parser.parse_args()
+
+    pygame.font.init()
+    if args.replay or args.best:
+        try:
+            if args.replay:
+                replay = Replay.load(args.replay)
+            else:
+                from records import default_service
+                data = default_service().leaderboard.best_replay(args.best)
+                if data is None:
+                    print(f"No hay repetición guardada para {args.best}")
+                    return 1
+                replay = Replay.from_bytes(data)
+        except ReplayError as e:
+            print(f"No se puede reproducir: {e}")
+            return 1
+        return 0 if print_verification(replay) else 1
+
+    start = time.perf_counter()
+    total_ticks = 0
+    for i in range(args.runs):
+        result = run_headless(args.seed + i, hover_pilot)
+        total_ticks += result["ticks"]
+        print(f"seed={result['seed']} ticks={result['ticks']} score={result['score']} "
+              f"distancia={result['distance']} salud={result['health']}")
+    elapsed = time.perf_counter() - start
+    print(f"{total_ticks} ticks en {elapsed:.2f}s ({total_ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+import pygame
+from collections import OrderedDict
+
+WHITE = (255, 255, 255)
+HINT_GRAY = (200, 200, 200)
+
+
+class TextCache:
+    """Caché LRU de textos ya renderizados, indexada por (fuente, texto, color)."""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color=WHITE):
+        key = (font, text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            return surf
+        surf = font.render(text, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+class Label:
+    """Texto ligado a un valor: solo se vuelve a renderizar cuando el valor cambia."""
+    __slots__ = ("font", "color", "fmt", "value", "surface")
+
+    def __init__(self, font, fmt, color=WHITE):
+        self.font = font
+        self.fmt = fmt
+        self.color = color
+        self.value = None
+        self.surface = None
+
+    def bind(self, value):
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = self.font.render(self.fmt.format(*value), True, self.color)
+        return self.surface
+
+
+class HUD:
+    """
+    Interfaz en modo retenido:
+    - Score y distancia son etiquetas que se renderizan solo al cambiar.
+    - Textos fijos (ayuda, mensajes) salen de la caché LRU.
+    - Las capas oscuras de pausa y fin de partida se construyen una sola vez.
+    Cada frame queda en unas pocas blits.
+    """
+
+    def __init__(self, font, small_font, width, height, cache=None):
+        self.font = font
+        self.small_font = small_font
+        self.width = width
+        self.height = height
+        self.cache = cache if cache is not None else TextCache()
+
+        self.score_label = Label(font, "{} — Score: {}")
+        self.distance_label = Label(small_font, "Distancia: {}/{}")
+        self.endless_distance_label = Label(small_font, "Distancia: {}")
+        self.overlays = {}
+
+    def _overlay(self, alpha):
+        overlay = self.overlays.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))
+            if pygame.display.get_surface() is not None:
+                overlay = overlay.convert_alpha()
+            self.overlays[alpha] = overlay
+        return overlay
+
+    def _centered(self, surf, y):
+        return surf, (self.width // 2 - surf.get_width() // 2, y)
+
+    def stats_blits(self, player_name, score, distance, target_distance):
+        """Sin distancia objetivo (modo infinito) se muestra solo la recorrida."""
+        if target_distance is None:
+            distance_surf = self.endless_distance_label.bind((distance,))
+        else:
+            distance_surf = self.distance_label.bind((distance, target_distance))
+        hint = self.cache.render(self.small_font, "P = Pausa  |  R = Reiniciar cuando pierdas", HINT_GRAY)
+        return [
+            (self.score_label.bind((player_name, score)), (20, 20)),
+            (distance_surf, (20, 55)),
+            (hint, (20, self.height - 40)),
+        ]
+
+    def pause_blits(self):
+        t = self.cache.render(self.font, "PAUSA", WHITE)
+        t2 = self.cache.render(self.small_font, "Presiona P para continuar — R para reiniciar", HINT_GRAY)
+        return [
+            (self._overlay(160), (0, 0)),
+            self._centered(t, 280),
+            self._centered(t2, 340),
+        ]
+
+    def message_blits(self, line1, line2, dim=True):
+        t1 = self.cache.render(self.font, line1, WHITE)
+        t2 = self.cache.render(self.small_font, line2, WHITE)
+        blits = [(self._overlay(180), (0, 0))] if dim else []
+        blits.append(self._centered(t1, 300))
+        blits.append(self._centered(t2, 360))
+        return blits
@@ -0,0 +1,231 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+LEADERBOARD_DB = "records.db"
+LEGACY_RECORD_FILE = "records.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    distance INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, id);
+CREATE INDEX IF NOT EXISTS runs_by_name ON runs (name, score DESC);
+
+CREATE TABLE IF NOT EXISTS bests (
+    name TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    distance INTEGER NOT NULL,
+    run_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bests_by_score ON bests (score DESC, name);
+
+CREATE TABLE IF NOT EXISTS replays (
+    run_id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class _Fenwick:
+    """Árbol de Fenwick sobre scores enteros: conteos y prefijos en O(log n)."""
+
+    def __init__(self, size=1024):
+        self.tree = [0] * (size + 1)
+
+    def _grow(self, score):
+        size = len(self.tree) - 1
+        if score < size:
+            return
+        while size <= score:
+            size *= 2
+        counts = [self.count_at(s) for s in range(len(self.tree) - 1)]
+        self.tree = [0] * (size + 1)
+        for s, c in enumerate(counts):
+            if c:
+                self.add(s, c)
+
+    def add(self, score, delta):
+        score = max(0, score)
+        self._grow(score)
+        i = score + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, score):
+        """Cantidad de entradas con score <= `score`."""
+        i = min(max(score + 1, 0), len(self.tree) - 1)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def count_at(self, score):
+        return self.prefix(score) - self.prefix(score - 1)
+
+    def total(self):
+        return self.prefix(len(self.tree) - 2)
+
+
+class Leaderboard:
+    """
+    Récords en SQLite (modo WAL):
+    - runs guarda todas las partidas; bests, el mejor resultado de cada jugador.
+    - replays guarda la repetición de cada partida que la tenga (ver replay.py).
+    - Las consultas de top, recientes y por jugador van por índice y paginadas.
+    - El ranking de un score sale de un árbol de Fenwick en memoria, en O(log n).
+    - La primera vez importa los récords de records.json.
+    """
+
+    def __init__(self, path=LEADERBOARD_DB, legacy_path=LEGACY_RECORD_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        db = self._db()
+        db.executescript(SCHEMA)
+        self._migrate(legacy_path)
+
+        self._ranks = _Fenwick()
+        for score, count in db.execute("SELECT score, COUNT(*) FROM bests GROUP BY score"):
+            self._ranks.add(score, count)
+
+    def _db(self):
+        # Una conexión por hilo (el escritor de récords corre en su propio hilo)
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _migrate(self, legacy_path):
+        db = self._db()
+        if db.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+            return
+        records = []
+        if legacy_path and os.path.exists(legacy_path):
+            try:
+                with open(legacy_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    records = data
+            except Exception:
+                records = []
+        with db:
+            for rec in records:
+                try:
+                    self._insert(db, str(rec["name"]), int(rec["score"]), int(rec["distance"]), 0.0)
+                except (KeyError, TypeError, ValueError):
+                    continue
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_json', ?)",
+                       (str(len(records)),))
+
+    @staticmethod
+    def _insert(db, name, score, distance, created_at):
+        """
+        Inserta la partida y actualiza el mejor del jugador.
+        Devuelve (id de la partida, score anterior o None, si mejoró).
+        """
+        cur = db.execute("INSERT INTO runs (name, score, distance, created_at) VALUES (?, ?, ?, ?)",
+                         (name, score, distance, created_at))
+        run_id = cur.lastrowid
+        row = db.execute("SELECT score FROM bests WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            db.execute("INSERT INTO bests (name, score, distance, run_id) VALUES (?, ?, ?, ?)",
+                       (name, score, distance, run_id))
+            return run_id, None, True
+        if score > row[0]:
+            db.execute("UPDATE bests SET score = ?, distance = ?, run_id = ? WHERE name = ?",
+                       (score, distance, run_id, name))
+            return run_id, row[0], True
+        return run_id, row[0], False
+
+    # ---------------------------------------
+    # ESCRITURA
+    # ---------------------------------------
+    def add_run(self, name, score, distance, replay=None):
+        db = self._db()
+        with db:
+            run_id, previous, improved = self._insert(db, name, score, distance, time.time())
+            if replay is not None:
+                db.execute("INSERT INTO replays (run_id, data) VALUES (?, ?)", (run_id, replay))
+        if improved:
+            with self._lock:
+                if previous is not None:
+                    self._ranks.add(previous, -1)
+                self._ranks.add(score, 1)
+
+    # ---------------------------------------
+    # CONSULTAS
+    # ---------------------------------------
+    def top(self, limit=10, offset=0):
+        """Mejor resultado de cada jugador, de mayor a menor score."""
+        rows = self._db().execute(
+            "SELECT name, score, distance FROM bests ORDER BY score DESC, name LIMIT ? OFFSET ?",
+            (limit, offset))
+        return [{"rank": offset + i + 1, "name": n, "score": s, "distance": d}
+                for i, (n, s, d) in enumerate(rows)]
+
+    def top_runs(self, limit=10, offset=0):
+        """Todas las partidas, de mayor a menor score."""
+        rows = self._db().execute(
+            "SELECT name, score, distance FROM runs ORDER BY score DESC, id LIMIT ? OFFSET ?",
+            (limit, offset))
+        return [{"name": n, "score": s, "distance": d} for n, s, d in rows]
+
+    def recent(self, limit=10, offset=0):
+        """Últimas partidas jugadas."""
+        rows = self._db().execute(
+            "SELECT name, score, distance FROM runs ORDER BY id DESC LIMIT ? OFFSET ?",
+            (limit, offset))
+        return [{"name": n, "score": s, "distance": d} for n, s, d in rows]
+
+    def player_runs(self, name, limit=10, offset=0):
+        """Partidas de un jugador, de mayor a menor score."""
+        rows = self._db().execute(
+            "SELECT name, score, distance FROM runs WHERE name = ? ORDER BY score DESC LIMIT ? OFFSET ?",
+            (name, limit, offset))
+        return [{"name": n, "score": s, "distance": d} for n, s, d in rows]
+
+    def best(self, name):
+        row = self._db().execute(
+            "SELECT name, score, distance FROM bests WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "score": row[1], "distance": row[2], "rank": self.rank(row[1])}
+
+    def replay(self, run_id):
+        """Bytes de la repetición de una partida, o None."""
+        row = self._db().execute("SELECT data FROM replays WHERE run_id = ?", (run_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def best_replay(self, name):
+        """Repetición de la mejor partida de un jugador, o None."""
+        row = self._db().execute(
+            "SELECT r.data FROM bests b JOIN replays r ON r.run_id = b.run_id WHERE b.name = ?",
+            (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def rank(self, score):
+        """Posición que ocuparía `score` entre los mejores de cada jugador (1 = primero)."""
+        with self._lock:
+            return self._ranks.total() - self._ranks.prefix(score) + 1
+
+    def player_count(self):
+        with self._lock:
+            return self._ranks.total()
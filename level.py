@@ -0,0 +1,123 @@
+import queue
+import random
+import threading
+
+from entities import SCROLL_SPEED
+from display import SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Un punto de aparición cada 71 ticks, como en el modo normal
+SPAWN_SPACING = 71 * SCROLL_SPEED
+SLOTS_PER_CHUNK = 8
+CHUNK_WIDTH = SPAWN_SPACING * SLOTS_PER_CHUNK
+# Tramos generados por adelantado (y máximo en memoria además del actual)
+LOOKAHEAD = 4
+# Tramos hasta llegar a la dificultad máxima
+RAMP_CHUNKS = 24
+
+# Tipos de entrada en la lista de aparición de un tramo
+OBSTACLE = "obstacle"
+TURRET = "turret"
+COIN = "coin"
+MEDIKIT = "medikit"
+
+
+class Chunk:
+    """Tramo de mundo de ancho fijo: [x, end) y sus apariciones (x, tipo, valor) ordenadas por x."""
+    __slots__ = ("index", "x", "end", "difficulty", "spawns")
+
+    def __init__(self, index, x, difficulty, spawns):
+        self.index = index
+        self.x = x
+        self.end = x + CHUNK_WIDTH
+        self.difficulty = difficulty
+        self.spawns = spawns
+
+
+class LevelGenerator:
+    """
+    Generador de tramos por semilla. Cada tramo usa su propio RNG derivado
+    de (semilla, índice), así el contenido es el mismo sin importar en qué
+    orden o en qué hilo se genere.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    @staticmethod
+    def difficulty(index):
+        """De 0 (primer tramo) a 1 (desde RAMP_CHUNKS en adelante)."""
+        return min(1.0, index / RAMP_CHUNKS)
+
+    def chunk(self, index):
+        rng = random.Random(self.seed * 1_000_003 + index)
+        difficulty = self.difficulty(index)
+        # El primer tramo empieza en el borde derecho de la pantalla inicial
+        x = SCREEN_WIDTH + index * CHUNK_WIDTH
+
+        obstacle_chance = 0.35 + 0.20 * difficulty
+        turret_chance = 0.15 + 0.20 * difficulty
+        coin_chance = 0.45
+        medikit_chance = 0.05 - 0.02 * difficulty
+
+        spawns = []
+        for slot in range(1, SLOTS_PER_CHUNK + 1):
+            slot_x = x + slot * SPAWN_SPACING
+            if rng.random() < obstacle_chance:
+                spawns.append((slot_x, OBSTACLE, rng.randint(70, 180)))
+            if rng.random() < turret_chance:
+                spawns.append((slot_x, TURRET, rng.randint(150, SCREEN_HEIGHT - 180)))
+            if rng.random() < coin_chance:
+                spawns.append((slot_x, COIN, rng.randint(100, SCREEN_HEIGHT - 200)))
+            if rng.random() < medikit_chance:
+                spawns.append((slot_x, MEDIKIT, rng.randint(100, SCREEN_HEIGHT - 150)))
+        return Chunk(index, x, difficulty, spawns)
+
+
+class LevelStream:
+    """
+    Tramos del modo infinito generados por adelantado:
+    - Un hilo llena una cola acotada con los próximos tramos.
+    - next_chunk() entrega el siguiente en orden; el juego suelta el
+      anterior, así la memoria no crece con la distancia.
+    - `start` permite retomar desde un tramo (al restaurar una partida).
+    """
+
+    def __init__(self, seed, lookahead=LOOKAHEAD, start=0):
+        self.generator = LevelGenerator(seed)
+        self.start = start
+        self._chunks = queue.Queue(maxsize=lookahead)
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._fill_loop, name="level-stream", daemon=True)
+        self._worker.start()
+
+    def _fill_loop(self):
+        index = self.start
+        while not self._stop.is_set():
+            chunk = self.generator.chunk(index)
+            while not self._stop.is_set():
+                try:
+                    self._chunks.put(chunk, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            index += 1
+
+    def next_chunk(self):
+        return self._chunks.get()
+
+    def pending(self):
+        """Tramos listos en la cola."""
+        return self._chunks.qsize()
+
+    def close(self):
+        """
+        Detiene el hilo generador sin esperarlo (se llama desde el hilo del
+        juego al perder, ganar o reiniciar): vaciar la cola destraba un put
+        pendiente y el hilo, que es daemon, termina solo.
+        """
+        self._stop.set()
+        try:
+            while True:
+                self._chunks.get_nowait()
+        except queue.Empty:
+            pass
@@ -1,120 +1,248 @@
-import pygame
-from game import Game
-from records import get_top_records, save_record  # Cambiado desde load_record
+import threading
 
-pygame.init()
-SCREEN = pygame.display.set_mode((800, 600))
+import pygame
+from hud import TextCache
+from display import SCREEN_SIZE, RENDER_SCALES
+
+# Arranque mínimo: solo ventana y fuentes. El juego (NumPy incluido), los
+# sonidos y los récords se cargan en segundo plano después del primer frame
+# del menú (ver warm_up), y el mezclador se abre con el primer sonido.
+pygame.display.init()
+pygame.font.init()
+# La ventana ya tiene el tamaño del juego: no hay cambio de modo al empezar
+SCREEN = pygame.display.set_mode(SCREEN_SIZE)
 pygame.display.set_caption("Helicopter Shooter - Menú Principal")
 FONT = pygame.font.Font(None, 48)
 SMALL = pygame.font.Font(None, 28)
-clock = pygame.time.Clock()
+TEXT_CACHE = TextCache()
+
+# Los menús no tienen animaciones: se bloquea esperando eventos y solo se
+# repinta (y se envía a la pantalla) la zona que cambió.
+MENU_BG = (8, 14, 30)
+NAME_BG = (18, 24, 40)
+RECORDS_BG = (12, 18, 30)
 
 
 def draw_text_center(surface, text, y, font, color=(255, 255, 255)):
-    surf = font.render(text, True, color)
-    surface.blit(surf, (surface.get_width() // 2 - surf.get_width() // 2, y))
+    surf = TEXT_CACHE.render(font, text, color)
+    rect = surf.get_rect(midtop=(surface.get_width() // 2, y))
+    surface.blit(surf, rect)
+    return rect
+
+
+def row_rect(surface, y, font):
+    """Franja a todo lo ancho que ocupa una línea de texto en `y`."""
+    return pygame.Rect(0, y, surface.get_width(), font.get_linesize())
+
+
+def warm_up():
+    """Importa el juego y prepara sonidos y récords mientras el menú espera al jugador."""
+    import game  # noqa: F401 (arrastra NumPy, efectos, entidades y sprites)
+    from effects import SoundManager, SHOOT_SOUND, EXPLOSION_SOUND, COIN_SOUND
+    from records import default_service
+
+    for spec in (SHOOT_SOUND, EXPLOSION_SOUND, COIN_SOUND):
+        SoundManager.load_pcm(spec)
+    default_service()
+
+
+def start_warm_up():
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_key():
+    """Bloquea hasta la próxima tecla o cierre de ventana; el resto de eventos se ignora."""
+    while True:
+        event = pygame.event.wait()
+        if event.type in (pygame.QUIT, pygame.KEYDOWN):
+            return event
 
 
 def input_name_screen():
     """Pantalla para que el jugador escriba su nombre antes de jugar."""
     name = ""
-    active = True
-    while active:
-        SCREEN.fill((18, 24, 40))
-        draw_text_center(SCREEN, "Ingresa tu nombre (ENTER para aceptar)", 140, FONT, (180, 220, 255))
-
-        # cuadro de texto
-        box = pygame.Rect(200, 260, 400, 60)
-        pygame.draw.rect(SCREEN, (255, 255, 255), box, 2)
-        name_surf = FONT.render(name or "Jugador", True, (255, 255, 255))
-        SCREEN.blit(name_surf, (box.x + 10, box.y + 8))
-
-        draw_text_center(SCREEN, "ESC para volver al menú", 360, SMALL, (200, 200, 200))
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return None
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    return name.strip() or "Jugador"
-                elif event.key == pygame.K_ESCAPE:
-                    return None
-                elif event.key == pygame.K_BACKSPACE:
-                    name = name[:-1]
-                else:
-                    if len(event.unicode) == 1 and len(name) < 16:
-                        name += event.unicode
-
-        pygame.display.flip()
-        clock.tick(30)
+    box = pygame.Rect(0, 260, 400, 60)
+    box.centerx = SCREEN.get_width() // 2
+
+    SCREEN.fill(NAME_BG)
+    draw_text_center(SCREEN, "Ingresa tu nombre (ENTER para aceptar)", 140, FONT, (180, 220, 255))
+    draw_text_center(SCREEN, "ESC para volver al menú", 360, SMALL, (200, 200, 200))
+    dirty = [SCREEN.get_rect()]
+
+    while True:
+        if dirty:
+            # cuadro de texto
+            SCREEN.fill(NAME_BG, box)
+            pygame.draw.rect(SCREEN, (255, 255, 255), box, 2)
+            name_surf = FONT.render(name or "Jugador", True, (255, 255, 255))
+            SCREEN.blit(name_surf, (box.x + 10, box.y + 8), area=pygame.Rect(0, 0, box.width - 20, box.height))
+            dirty.append(box)
+            pygame.display.update(dirty)
+            dirty = []
+
+        event = wait_key()
+        if event.type == pygame.QUIT:
+            return None
+        if event.key == pygame.K_RETURN:
+            return name.strip() or "Jugador"
+        elif event.key == pygame.K_ESCAPE:
+            return None
+        elif event.key == pygame.K_BACKSPACE:
+            if name:
+                name = name[:-1]
+                dirty = [box]
+        else:
+            if len(event.unicode) == 1 and len(name) < 16:
+                name += event.unicode
+                dirty = [box]
+
+
+RECORDS_PER_PAGE = 5
+RECORD_VIEWS = [("Mejores Récords", "top"), ("Últimas Partidas", "recent")]
 
 
 def show_record_screen():
-    """Mostrar los últimos 5 récords de jugadores"""
-    SCREEN.fill((12, 18, 30))
-    all_records = get_top_records(1000)  # traer todos los registros
-    draw_text_center(SCREEN, "Últimos Récords", 80, FONT, (255, 215, 120))
-
-    if not all_records:
-        draw_text_center(SCREEN, "Aún no hay récords", 200, FONT)
-    else:
-        # Tomamos los últimos 5 registros
-        last_records = all_records[-5:]
-        start_y = 180
-        for i, rec in enumerate(last_records):
-            y = start_y + i * 40
-            draw_text_center(SCREEN, f"{rec['name']} — {rec['score']}", y, SMALL, (255, 255, 255))
-
-    draw_text_center(SCREEN, "Presiona ESC para volver al menú", 500, SMALL, (180, 180, 180))
-
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                waiting = False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                waiting = False
-        pygame.display.flip()
-        clock.tick(30)
-
-
-def main_menu():
-    options = ["Iniciar juego", "Ver récords", "Salir"]
+    """Mostrar los récords por páginas: mejores por jugador o últimas partidas."""
+    from records import default_service
+    leaderboard = default_service().leaderboard
+    view = 0
+    page = 0
+
+    SCREEN.fill(RECORDS_BG)
+    draw_text_center(SCREEN, "IZQ/DER página  |  TAB cambia vista  |  ESC volver", 500, SMALL, (180, 180, 180))
+    dirty = [SCREEN.get_rect()]
+    # Zona que cambia al pasar de página o de vista: título, lista y número de página
+    content = pygame.Rect(0, 70, SCREEN.get_width(), 400)
+
+    while True:
+        if dirty:
+            title, kind = RECORD_VIEWS[view]
+            query = leaderboard.top if kind == "top" else leaderboard.recent
+            # Se pide una fila de más para saber si hay página siguiente
+            rows = query(RECORDS_PER_PAGE + 1, page * RECORDS_PER_PAGE)
+            has_next = len(rows) > RECORDS_PER_PAGE
+            rows = rows[:RECORDS_PER_PAGE]
+
+            SCREEN.fill(RECORDS_BG, content)
+            draw_text_center(SCREEN, title, 80, FONT, (255, 215, 120))
+            if not rows:
+                draw_text_center(SCREEN, "Aún no hay récords", 200, FONT)
+            else:
+                start_y = 180
+                for i, rec in enumerate(rows):
+                    y = start_y + i * 40
+                    prefix = f"{rec['rank']}. " if "rank" in rec else ""
+                    draw_text_center(SCREEN, f"{prefix}{rec['name']} — {rec['score']}", y, SMALL, (255, 255, 255))
+            draw_text_center(SCREEN, f"Página {page + 1}", 400, SMALL, (180, 180, 180))
+            dirty.append(content)
+            pygame.display.update(dirty)
+            dirty = []
+
+        event = wait_key()
+        if event.type == pygame.QUIT or event.key == pygame.K_ESCAPE:
+            return
+        if event.key == pygame.K_RIGHT and has_next:
+            page += 1
+            dirty = [content]
+        elif event.key == pygame.K_LEFT and page > 0:
+            page -= 1
+            dirty = [content]
+        elif event.key == pygame.K_TAB:
+            view = (view + 1) % len(RECORD_VIEWS)
+            page = 0
+            dirty = [content]
+
+
+def draw_menu_option(options, i, selected):
+    y = 200 + i * 80
+    rect = row_rect(SCREEN, y, FONT)
+    SCREEN.fill(MENU_BG, rect)
+    color = (255, 215, 0) if i == selected else (255, 255, 255)
+    draw_text_center(SCREEN, options[i], y, FONT, color)
+    return rect
+
+
+def draw_main_menu(options, selected):
+    SCREEN.fill(MENU_BG)
+    draw_text_center(SCREEN, "🚁 Helicopter Shooter 🚁", 80, FONT, (120, 200, 255))
+    for i in range(len(options)):
+        draw_menu_option(options, i, selected)
+    draw_text_center(SCREEN, "Usa ARRIBA/ABAJO y ENTER para elegir", 500, SMALL, (180, 180, 180))
+    pygame.display.flip()
+
+
+MENU_OPTIONS = ["Iniciar juego", "Modo infinito", "Ver récords", "Salir"]
+
+
+def main_menu(render_scale=1.0, smooth=False, quality_level=None):
+    """
+    render_scale y smooth: resolución interna del juego (ver display.py); el
+    menú va siempre a la nativa. quality_level: nivel de detalle fijo; sin
+    él, se adapta al tiempo de frame (ver quality.py).
+    """
+    options = list(MENU_OPTIONS)
     selected = 0
+    # Un solo juego (y sus recursos) para todas las partidas de la sesión
+    game = None
+    draw_main_menu(options, selected)
+    start_warm_up()
+
     running = True
     while running:
-        SCREEN.fill((8, 14, 30))
-        draw_text_center(SCREEN, "🚁 Helicopter Shooter 🚁", 80, FONT, (120, 200, 255))
-
-        for i, opt in enumerate(options):
-            color = (255, 215, 0) if i == selected else (255, 255, 255)
-            draw_text_center(SCREEN, opt, 200 + i * 80, FONT, color)
-
-        draw_text_center(SCREEN, "Usa ARRIBA/ABAJO y ENTER para elegir", 500, SMALL, (180, 180, 180))
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        event = wait_key()
+        if event.type == pygame.QUIT:
+            running = False
+            continue
+
+        if event.key in (pygame.K_UP, pygame.K_DOWN):
+            previous = selected
+            step = -1 if event.key == pygame.K_UP else 1
+            selected = (selected + step) % len(options)
+            # Solo cambian las dos opciones involucradas
+            pygame.display.update([draw_menu_option(options, previous, selected),
+                                   draw_menu_option(options, selected, selected)])
+        elif event.key == pygame.K_RETURN:
+            if selected in (0, 1):
+                player_name = input_name_screen()
+                if player_name is not None:
+                    if game is None:
+                        from game import Game
+                        from resources import Resources
+                        resources = Resources(text_cache=TEXT_CACHE, render_scale=render_scale,
+                                              smooth=smooth, quality_level=quality_level)
+                        game = Game(player_name, infinite=selected == 1, resources=resources)
+                    else:
+                        game.reset(player_name, infinite=selected == 1)
+                    game.run()
+            elif selected == 2:
+                show_record_screen()
+            elif selected == 3:
                 running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    selected = (selected - 1) % len(options)
-                elif event.key == pygame.K_DOWN:
-                    selected = (selected + 1) % len(options)
-                elif event.key == pygame.K_RETURN:
-                    if selected == 0:
-                        player_name = input_name_screen()
-                        if player_name is not None:
-                            Game(player_name).run()
-                    elif selected == 1:
-                        show_record_screen()
-                    elif selected == 2:
-                        running = False
-
-        pygame.display.flip()
-        clock.tick(30)
+            if running:
+                draw_main_menu(options, selected)
 
     pygame.quit()
 
 
+def parse_args():
+    # argparse se importa acá y no arriba: no hace falta para el primer frame del menú
+    import argparse
+    parser = argparse.ArgumentParser(description="Helicopter Shooter")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="resolución interna del juego respecto de la ventana "
+                             f"(por ejemplo {', '.join(map(str, RENDER_SCALES))})")
+    parser.add_argument("--smooth", action="store_true",
+                        help="estira la imagen con suavizado (más lento que el escalado simple)")
+    parser.add_argument("--quality", type=int, choices=range(4), default=None,
+                        help="nivel de detalle fijo, de 0 (alto) a 3 (mínimo); por defecto se adapta solo")
+    args = parser.parse_args()
+    if not 0 < args.render_scale <= 1:
+        parser.error("--render-scale debe estar entre 0 (excluido) y 1")
+    return args
+
+
 if __name__ == "__main__":
-    main_menu()
+    args = parse_args()
+    main_menu(args.render_scale, args.smooth, args.quality)
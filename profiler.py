@@ -0,0 +1,198 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pygame
+
+OVERLAY_BG = (0, 0, 0, 170)
+OVERLAY_TEXT = (230, 230, 230)
+# El texto de la capa se vuelve a renderizar cada tantos frames
+OVERLAY_REFRESH = 15
+# Frames guardados para exportar (unos 5 minutos a 60 FPS)
+MAX_RECORDED_FRAMES = 18000
+
+
+class _NullScope:
+    """Scope que no hace nada: es lo que se entrega con el profiler apagado."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._add(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Profiler:
+    """
+    Profiler de frames por scopes con nombre:
+    - `with profiler.scope("fase"):` mide una fase; apagado, solo cuesta
+      devolver un scope vacío compartido.
+    - Cada frame guarda el total por fase; la capa en pantalla muestra el
+      promedio de los últimos `window` frames y la cantidad de entidades.
+    - export() escribe un trace JSON (chrome://tracing / Perfetto) y un CSV
+      con una fila por frame.
+    """
+
+    def __init__(self, window=120, max_frames=MAX_RECORDED_FRAMES):
+        self.enabled = False
+        self.window = window
+        self.origin = time.perf_counter_ns()
+        self.frame_index = 0
+        self.frame_start = 0
+        self.current = {}
+        self.recent = deque(maxlen=window)
+        # Para exportar: (índice, inicio ns, fin ns, {fase: ns}, {tipo: cantidad})
+        self.frames = deque(maxlen=max_frames)
+        # Eventos del trace: (nombre, inicio ns, duración ns, id de hilo)
+        self.events = deque(maxlen=max_frames * 24)
+        # Marcas instantáneas (por ejemplo, cambios de calidad): (nombre, ns, {datos})
+        self.marks = deque(maxlen=max_frames)
+        self._overlay_surface = None
+
+    # ---------------------------------------
+    # MEDICIÓN
+    # ---------------------------------------
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def _add(self, name, start, end):
+        duration = end - start
+        self.current[name] = self.current.get(name, 0) + duration
+        self.events.append((name, start, duration, threading.get_ident()))
+
+    def mark(self, name, args=None):
+        """Registra un suceso puntual con sus datos; aparece como evento instantáneo en el trace."""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter_ns(), args or {}))
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = {}
+        self.frame_start = time.perf_counter_ns()
+        self.recent.clear()
+        self._overlay_surface = None
+        return self.enabled
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current = {}
+            self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self, counts=None):
+        if not self.enabled:
+            return
+        end = time.perf_counter_ns()
+        counts = counts or {}
+        self.recent.append((end - self.frame_start, self.current, counts))
+        self.frames.append((self.frame_index, self.frame_start, end, self.current, counts))
+        self.frame_index += 1
+        if self.frame_index % OVERLAY_REFRESH == 0:
+            self._overlay_surface = None
+
+    def averages(self):
+        """(ms por frame, {fase: ms promedio}) sobre la ventana reciente."""
+        if not self.recent:
+            return 0.0, {}
+        n = len(self.recent)
+        totals = {}
+        for _, phases, _ in self.recent:
+            for name, ns in phases.items():
+                totals[name] = totals.get(name, 0) + ns
+        frame_ms = sum(f[0] for f in self.recent) / n / 1e6
+        return frame_ms, {name: ns / n / 1e6 for name, ns in totals.items()}
+
+    # ---------------------------------------
+    # CAPA EN PANTALLA
+    # ---------------------------------------
+    def overlay_blits(self, font, pos=(10, 90)):
+        """Blits de la capa (vacía si está apagado); el texto se renueva cada OVERLAY_REFRESH frames."""
+        if not self.enabled:
+            return []
+        if self._overlay_surface is None:
+            frame_ms, phases = self.averages()
+            lines = [f"frame {frame_ms:6.2f} ms  ({1000 / frame_ms if frame_ms else 0:5.1f} FPS)"]
+            for name, ms in sorted(phases.items(), key=lambda item: item[1], reverse=True):
+                lines.append(f"{name:<22s}{ms:7.3f} ms")
+            if self.recent:
+                counts = self.recent[-1][2]
+                lines.append("  ".join(f"{name}={count}" for name, count in counts.items()))
+            rendered = [font.render(line, True, OVERLAY_TEXT) for line in lines]
+            height = font.get_linesize()
+            width = max(s.get_width() for s in rendered) + 12
+            surf = pygame.Surface((width, height * len(rendered) + 8), pygame.SRCALPHA)
+            surf.fill(OVERLAY_BG)
+            for i, s in enumerate(rendered):
+                surf.blit(s, (6, 4 + i * height))
+            self._overlay_surface = surf
+        return [(self._overlay_surface, pos)]
+
+    # ---------------------------------------
+    # EXPORTACIÓN
+    # ---------------------------------------
+    def trace_events(self):
+        """Eventos en el formato de Chrome trace (tiempos en microsegundos)."""
+        origin = self.origin
+        pid = os.getpid()
+        events = [{"name": "frame", "ph": "X", "pid": pid, "tid": "frames",
+                   "ts": (start - origin) / 1000, "dur": (end - start) / 1000,
+                   "args": {"index": index}}
+                  for index, start, end, _, _ in self.frames]
+        events.extend({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                       "ts": (start - origin) / 1000, "dur": duration / 1000}
+                      for name, start, duration, tid in self.events)
+        events.extend({"name": "entidades", "ph": "C", "pid": pid,
+                       "ts": (start - origin) / 1000, "args": counts}
+                      for _, start, _, _, counts in self.frames if counts)
+        events.extend({"name": name, "ph": "i", "s": "g", "pid": pid,
+                       "ts": (ts - origin) / 1000, "args": args}
+                      for name, ts, args in self.marks)
+        return events
+
+    def export(self, path_prefix=None):
+        """Escribe <prefijo>.json (trace) y <prefijo>.csv (por frame); devuelve las rutas."""
+        if path_prefix is None:
+            path_prefix = time.strftime("profile-%Y%m%d-%H%M%S")
+        trace_path = path_prefix + ".json"
+        csv_path = path_prefix + ".csv"
+
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+        phases = []
+        kinds = []
+        for _, _, _, frame_phases, counts in self.frames:
+            phases.extend(name for name in frame_phases if name not in phases)
+            kinds.extend(name for name in counts if name not in kinds)
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ms", "frame_ms"] + [p + "_ms" for p in phases] + kinds)
+            for index, start, end, frame_phases, counts in self.frames:
+                writer.writerow([index, f"{(start - self.origin) / 1e6:.3f}", f"{(end - start) / 1e6:.3f}"]
+                                + [f"{frame_phases.get(p, 0) / 1e6:.3f}" for p in phases]
+                                + [counts.get(k, 0) for k in kinds])
+        return trace_path, csv_path
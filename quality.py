@@ -0,0 +1,133 @@
+"""
+Gobernador de calidad adaptativo.
+
+Mira el tiempo de trabajo de los últimos frames (entrada, ticks y dibujo,
+sin la espera de Clock.tick) y, si no entra en el presupuesto de un frame,
+baja un nivel de detalle; cuando sobra margen durante un rato, lo vuelve a
+subir. Solo cambia lo que se ve: la simulación es la misma en cualquier
+nivel, así que repeticiones y récords no se enteran.
+"""
+from collections import deque
+
+# Niveles de detalle, de mayor a menor:
+# - particles: fracción de las partículas que pide cada add_explosion
+# - particle_cap: máximo de partículas vivas
+# - clouds: nubes visibles; animated_clouds=False las deja fijas en el cielo
+# - simple_entities: sprites con colorkey en lugar de alfa por píxel y sin
+#   marcas de vida en las torretas (ver SpriteAtlas.set_simple)
+QUALITY_LEVELS = (
+    {"name": "alta", "particles": 1.0, "particle_cap": 10000,
+     "clouds": 6, "animated_clouds": True, "simple_entities": False},
+    {"name": "media", "particles": 0.6, "particle_cap": 1500,
+     "clouds": 4, "animated_clouds": True, "simple_entities": False},
+    {"name": "baja", "particles": 0.35, "particle_cap": 600,
+     "clouds": 3, "animated_clouds": False, "simple_entities": True},
+    {"name": "mínima", "particles": 0.15, "particle_cap": 200,
+     "clouds": 0, "animated_clouds": False, "simple_entities": True},
+)
+
+# Frames que se miran para decidir (medio segundo a 60 FPS)
+WINDOW = 30
+# Se baja si el p90 de la ventana pasa de esta fracción del presupuesto...
+DOWNGRADE_AT = 0.9
+# ...y se sube si queda por debajo de esta otra durante toda la ventana
+UPGRADE_AT = 0.5
+# Frames mínimos en un nivel antes de intentar subir
+UPGRADE_HOLD = 120
+# Tope de la espera cuando una subida se revierte enseguida
+MAX_UPGRADE_HOLD = 3600
+# Decisiones guardadas para telemetría
+MAX_DECISIONS = 256
+
+
+class QualityGovernor:
+    """
+    Nivel de calidad según el tiempo de frame reciente:
+    - record() recibe el tiempo de trabajo de cada frame; con la ventana
+      llena compara su p90 contra el presupuesto y baja o sube un nivel.
+    - Tras cada cambio la ventana se vacía, así la próxima decisión ya mide
+      el nivel nuevo; para subir además hay que esperar `hold` frames.
+    - Si una subida se revierte antes de que pase esa espera, la espera para
+      volver a subir se duplica (evita oscilar entre dos niveles).
+    - `decisions` guarda cada cambio (frame, niveles, p90 y presupuesto) y
+      telemetry() resume el estado.
+    adaptive=False deja el nivel fijo en `level`.
+    """
+
+    def __init__(self, budget_ms=1000 / 60, level=0, adaptive=True, levels=QUALITY_LEVELS):
+        if not 0 <= level < len(levels):
+            raise ValueError(f"nivel de calidad inválido: {level} (0 a {len(levels) - 1})")
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.level = level
+        self.adaptive = adaptive
+        self.samples = deque(maxlen=WINDOW)
+        self.frame = 0
+        self.last_change = 0
+        self.last_upgrade = None
+        self.hold = UPGRADE_HOLD
+        self.load_ms = 0.0
+        self.decisions = deque(maxlen=MAX_DECISIONS)
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    @property
+    def name(self):
+        return self.levels[self.level]["name"]
+
+    def record(self, frame_ms):
+        """Agrega el tiempo de trabajo de un frame; devuelve la decisión si cambió el nivel."""
+        self.frame += 1
+        if not self.adaptive:
+            return None
+        if self.last_upgrade is not None and self.frame - self.last_upgrade >= self.hold:
+            # La subida se sostuvo: la próxima vuelve a esperar lo normal
+            self.last_upgrade = None
+            self.hold = UPGRADE_HOLD
+        samples = self.samples
+        samples.append(frame_ms)
+        if len(samples) < WINDOW:
+            return None
+
+        self.load_ms = load = sorted(samples)[(WINDOW * 9) // 10]
+        budget = self.budget_ms
+        if load > budget * DOWNGRADE_AT and self.level < len(self.levels) - 1:
+            if self.last_upgrade is not None and self.frame - self.last_upgrade < self.hold:
+                self.hold = min(self.hold * 2, MAX_UPGRADE_HOLD)
+            self.last_upgrade = None
+            return self._change(self.level + 1, load)
+        if (load < budget * UPGRADE_AT and self.level > 0 and
+                self.frame - self.last_change >= self.hold):
+            self.last_upgrade = self.frame
+            return self._change(self.level - 1, load)
+        return None
+
+    def _change(self, level, load):
+        decision = {
+            "frame": self.frame,
+            "from": self.name,
+            "to": self.levels[level]["name"],
+            "level": level,
+            "p90_ms": round(load, 3),
+            "budget_ms": round(self.budget_ms, 3),
+        }
+        self.decisions.append(decision)
+        self.level = level
+        self.last_change = self.frame
+        self.samples.clear()
+        return decision
+
+    def telemetry(self):
+        """Estado actual y decisiones tomadas, listo para serializar."""
+        return {
+            "level": self.level,
+            "name": self.name,
+            "adaptive": self.adaptive,
+            "p90_ms": round(self.load_ms, 3),
+            "budget_ms": round(self.budget_ms, 3),
+            "upgrade_hold": self.hold,
+            "settings": dict(self.settings),
+            "decisions": list(self.decisions),
+        }
@@ -1,56 +1,72 @@
-import json
-import os
-
-RECORD_FILE = "records.json"
-
-def load_records():
-    """Devuelve la lista de récords guardados, ordenada de mayor a menor score."""
-    if not os.path.exists(RECORD_FILE):
-        return []
-    try:
-        with open(RECORD_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
-    except Exception:
-        return []
-
-def save_record(name, score, distance):
+import atexit
+import queue
+import threading
+
+from leaderboard import Leaderboard
+
+
+class RecordsService:
     """
-    Guarda el récord del jugador:
-    - Mantiene nombre, score y distancia.
-    - Si un mismo jugador tiene un score menor, se reemplaza.
-    - Ordena de mayor a menor score y guarda top 10.
+    Récords con escritura en segundo plano:
+    - submit() acepta como máximo un resultado por partida (run_id).
+    - Un hilo escritor guarda cada partida en el leaderboard (SQLite), así
+      el bucle de dibujo nunca toca el disco.
     """
-    records = load_records()
-
-    # Revisar si ya existe un récord de este jugador
-    updated = False
-    for rec in records:
-        if rec["name"] == name:
-            if score > rec["score"]:
-                rec["score"] = score
-                rec["distance"] = distance
-            updated = True
-            break
-
-    if not updated:
-        records.append({"name": name, "score": score, "distance": distance})
-
-    # Ordenar de mayor a menor score
-    records.sort(key=lambda r: r["score"], reverse=True)
-
-    # Guardar solo los top 10
-    records = records[:10]
-
-    try:
-        with open(RECORD_FILE, "w", encoding="utf-8") as f:
-            json.dump(records, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
-
-def get_top_records(n=10):
-    """Devuelve los top n récords ordenados por score."""
-    records = load_records()
-    return records[:n]
+
+    def __init__(self, leaderboard=None):
+        self.leaderboard = leaderboard if leaderboard is not None else Leaderboard()
+        self._lock = threading.Lock()
+        self._submitted = set()
+        self._pending = queue.Queue()
+        self._writer = None
+
+    def submit(self, run_id, name, score, distance, replay=None):
+        """
+        Registra el resultado de una partida. Devuelve False si esa partida ya
+        se guardó. `replay` son los bytes de la repetición (ver replay.py).
+        """
+        with self._lock:
+            if run_id is not None:
+                if run_id in self._submitted:
+                    return False
+                self._submitted.add(run_id)
+        self._ensure_writer()
+        self._pending.put((name, score, distance, replay))
+        return True
+
+    def flush(self):
+        """Espera a que el hilo escritor termine lo pendiente."""
+        if self._writer is not None:
+            self._pending.join()
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="records-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            name, score, distance, replay = self._pending.get()
+            try:
+                self.leaderboard.add_run(name, score, distance, replay)
+            except Exception:
+                pass
+            finally:
+                self._pending.task_done()
+
+
+_default_service = None
+# El menú lo pide desde el hilo de precarga y desde el principal: crear dos
+# servicios migraría dos veces los récords de records.json
+_default_service_lock = threading.Lock()
+
+
+def default_service():
+    """Servicio compartido por el menú y el juego (se crea al primer uso)."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = RecordsService()
+            atexit.register(_default_service.flush)
+        return _default_service
+
@@ -0,0 +1,137 @@
+"""
+Repeticiones: semilla + máscara de entrada de cada tick (ver controls.py).
+
+Formato binario (little endian):
+    cabecera  "HSRP", versión, flags (bit 0 = modo infinito), semilla,
+              ticks, score, distancia, largo del nombre + nombre en UTF-8
+    cuerpo    cantidad de tramos y, por tramo, máscara (1 byte) + cantidad
+              de ticks repetidos (varint)
+
+Las máscaras cambian poco de un tick al siguiente, así que una partida
+completa ocupa unos pocos KB. La reproducción está en headless.py.
+"""
+import struct
+
+MAGIC = b"HSRP"
+# Versión 2: colisiones por máscara (las repeticiones anteriores no se reproducen igual)
+REPLAY_VERSION = 2
+FLAG_INFINITE = 1
+
+_HEADER = struct.Struct("<4sBBqIIIH")
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("repetición truncada")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """Una partida grabada: semilla, resultado declarado y entradas comprimidas por tramos."""
+    __slots__ = ("seed", "player_name", "infinite", "ticks", "score", "distance", "runs")
+
+    def __init__(self, seed, player_name="Jugador", infinite=False, runs=None,
+                 ticks=0, score=0, distance=0):
+        self.seed = seed
+        self.player_name = player_name
+        self.infinite = infinite
+        self.runs = runs if runs is not None else []  # [máscara, ticks]
+        self.ticks = ticks
+        self.score = score
+        self.distance = distance
+
+    def masks(self):
+        """Máscara de cada tick, en orden."""
+        for mask, count in self.runs:
+            for _ in range(count):
+                yield mask
+
+    def to_bytes(self):
+        name = self.player_name.encode("utf-8")[:0xFFFF]
+        out = bytearray(_HEADER.pack(MAGIC, REPLAY_VERSION, FLAG_INFINITE if self.infinite else 0,
+                                     self.seed, self.ticks, self.score, self.distance, len(name)))
+        out += name
+        _write_varint(out, len(self.runs))
+        for mask, count in self.runs:
+            out.append(mask)
+            _write_varint(out, count)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < _HEADER.size:
+            raise ReplayError("repetición truncada")
+        magic, version, flags, seed, ticks, score, distance, name_len = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("no es una repetición")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"versión de repetición no soportada: {version}")
+        pos = _HEADER.size
+        name = data[pos:pos + name_len].decode("utf-8")
+        pos += name_len
+
+        count, pos = _read_varint(data, pos)
+        runs = []
+        for _ in range(count):
+            if pos >= len(data):
+                raise ReplayError("repetición truncada")
+            mask = data[pos]
+            length, pos = _read_varint(data, pos + 1)
+            runs.append([mask, length])
+        if sum(length for _, length in runs) != ticks:
+            raise ReplayError("la cantidad de ticks no coincide con las entradas")
+        return cls(seed, name, bool(flags & FLAG_INFINITE), runs, ticks, score, distance)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """Graba las máscaras de una partida en vivo; agregar un tick es O(1)."""
+    __slots__ = ("replay",)
+
+    def __init__(self, seed, player_name="Jugador", infinite=False):
+        self.replay = Replay(seed, player_name, infinite)
+
+    def record(self, mask):
+        runs = self.replay.runs
+        if runs and runs[-1][0] == mask:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.replay.ticks += 1
+
+    def finish(self, score, distance):
+        """Anota el resultado declarado y devuelve la repetición."""
+        self.replay.score = score
+        self.replay.distance = distance
+        return self.replay
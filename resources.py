@@ -0,0 +1,70 @@
+import pygame
+from effects import SoundManager
+from hud import HUD, TextCache
+from atlas import SpriteAtlas
+from profiler import Profiler
+from quality import QualityGovernor
+from display import Display, SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_SIZE
+
+
+class Resources:
+    """
+    Recursos que no dependen de la partida y se crean una sola vez:
+    - Pantalla (o superficie fuera de pantalla en headless), el lienzo a
+      la escala de render elegida (ver display.py) y reloj.
+    - Fuentes, caché de textos y HUD.
+    - Sonidos sintetizados (ninguno en headless).
+    - Sprites pre-renderizados de las entidades.
+    - El profiler de frames (F3 lo muestra, F4 exporta lo medido).
+    - El gobernador de calidad, que ajusta el detalle al tiempo de frame.
+    Se pasan a Game, así reiniciar una partida no vuelve a crear nada de esto.
+    """
+
+    def __init__(self, headless=False, text_cache=None, render_scale=1.0, smooth=False,
+                 quality_level=None):
+        """
+        render_scale: fracción de la resolución en que se dibuja el mundo
+        (1.0, 0.75, 0.5...); smooth=True lo estira con smoothscale.
+        quality_level: nivel de detalle fijo (ver quality.py); sin él, el
+        gobernador lo adapta empezando por el más alto.
+        """
+        self.headless = headless
+        if headless:
+            self.screen = pygame.Surface(SCREEN_SIZE)
+        else:
+            # Se reutiliza la ventana del menú si ya tiene el tamaño del juego
+            self.screen = pygame.display.get_surface()
+            if self.screen is None or self.screen.get_size() != SCREEN_SIZE:
+                self.screen = pygame.display.set_mode(SCREEN_SIZE)
+            pygame.display.set_caption("Helicopter Shooter")
+        self.display = Display(self.screen, render_scale, smooth)
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 36)
+        self.small_font = pygame.font.Font(None, 24)
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        self.hud = HUD(self.font, self.small_font, SCREEN_WIDTH, SCREEN_HEIGHT, self.text_cache)
+
+        # sonidos
+        self.shoot_sound = None
+        self.explosion_sound = None
+        self.coin_sound = None
+        if not headless:
+            try:
+                self.shoot_sound = SoundManager.generate_shoot_sound()
+                self.explosion_sound = SoundManager.generate_explosion_sound()
+                self.coin_sound = SoundManager.generate_coin_sound()
+            except Exception:
+                self.shoot_sound = None
+                self.explosion_sound = None
+                self.coin_sound = None
+
+        # Sprites pre-renderizados de las entidades
+        self.atlas = SpriteAtlas()
+
+        self.profiler = Profiler()
+        if quality_level is None:
+            self.quality = QualityGovernor()
+        else:
+            self.quality = QualityGovernor(level=quality_level, adaptive=False)
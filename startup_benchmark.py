@@ -0,0 +1,128 @@
+"""
+Benchmark de arranque de main.py.
+
+Lanza el menú en procesos nuevos (sin ventana) y mide:
+- Tiempo hasta el primer frame del menú, desde que se lanza el proceso y
+  desde que empieza a importarse main.py.
+- Costo de importación por módulo (python -X importtime), para ver qué
+  pesa en el camino crítico y confirmar que NumPy y el mezclador no se
+  cargan antes del menú.
+
+Uso:
+    python startup_benchmark.py --runs 5 --budget 400
+Sale con código 1 si la mediana del tiempo hasta el primer frame supera el presupuesto.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Proceso hijo: importa el menú y dibuja su primer frame
+FIRST_FRAME_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.draw_main_menu(main.MENU_OPTIONS, 0)
+frame = time.perf_counter()
+import pygame
+print(json.dumps({
+    "wall": time.time(),
+    "import_ms": (imported - start) * 1000,
+    "first_frame_ms": (frame - start) * 1000,
+    "numpy": "numpy" in sys.modules,
+    "mixer": bool(pygame.mixer.get_init()),
+}))
+"""
+
+
+def measure_first_frame():
+    launched = time.time()
+    out = subprocess.run([sys.executable, "-c", FIRST_FRAME_SCRIPT], cwd=HERE,
+                         capture_output=True, text=True, check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["launch_ms"] = (result.pop("wall") - launched) * 1000
+    return result
+
+
+def import_costs():
+    """(módulo, propio en ms, acumulado en ms, profundidad) de cada import de main.py."""
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=HERE,
+                         capture_output=True, text=True, check=True).stderr
+    costs = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        costs.append((name.strip(), self_us / 1000, cumulative_us / 1000, depth))
+    return costs
+
+
+def imported_by(costs, module, depth=1):
+    """Import de nivel `depth` que terminó cargando `module`, o None si no se cargó."""
+    # importtime lista cada módulo después de sus hijos: el padre es la
+    # siguiente línea con menor profundidad
+    for i, (name, _, _, d) in enumerate(costs):
+        if name != module:
+            continue
+        if d <= depth:
+            return name
+        for parent, _, _, pd in costs[i + 1:]:
+            if pd < d:
+                d = pd
+                if pd <= depth:
+                    return parent
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de Helicopter Shooter")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=400.0,
+                        help="presupuesto en ms para el primer frame del menú, desde el lanzamiento")
+    parser.add_argument("--top", type=int, default=12, help="módulos a mostrar")
+    args = parser.parse_args()
+
+    runs = [measure_first_frame() for _ in range(args.runs)]
+    launch = statistics.median(r["launch_ms"] for r in runs)
+    first_frame = statistics.median(r["first_frame_ms"] for r in runs)
+    imports = statistics.median(r["import_ms"] for r in runs)
+
+    print(f"Primer frame del menú ({args.runs} corridas, mediana)")
+    print(f"  desde el lanzamiento  {launch:8.1f} ms")
+    print(f"  desde import main     {first_frame:8.1f} ms  (import {imports:.1f} ms)")
+    costs = import_costs()
+    numpy_by = imported_by(costs, "numpy")
+    print(f"  NumPy cargado         {'no' if numpy_by is None else 'sí, por ' + numpy_by}")
+    print(f"  mezclador abierto     {'sí' if runs[-1]['mixer'] else 'no'}")
+
+    # Lo que importa main.py directamente: profundidad 1 entre el import
+    # anterior de primer nivel (arranque del intérprete) y main
+    end = next(i for i, c in enumerate(costs) if c[0] == "main" and c[3] == 0)
+    start = max((i for i in range(end) if costs[i][3] == 0), default=-1) + 1
+    direct = sorted((c for c in costs[start:end] if c[3] == 1), key=lambda c: c[2], reverse=True)
+    print(f"\nImports de main.py (acumulado, top {args.top})")
+    for name, own, cumulative, _ in direct[:args.top]:
+        print(f"  {name:28s} {cumulative:8.2f} ms  (propio {own:.2f} ms)")
+    print(f"  {'main (total)':28s} {costs[end][2]:8.2f} ms")
+
+    if launch > args.budget:
+        print(f"\nFUERA DE PRESUPUESTO: {launch:.1f} ms > {args.budget:.1f} ms")
+        return 1
+    print(f"\nDentro del presupuesto ({args.budget:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Tabla de parámetros de dificultad del modo normal.
+
+Los valores por defecto son los del juego; una partida con otros valores
+se crea con Game(tuning=Tuning(turret_cooldown=50, ...)). balance.py
+barre combinaciones de estos parámetros.
+"""
+from entities import TURRET_COOLDOWN, ENEMY_BULLET_SPEED
+
+# Nombre -> valor por defecto
+DEFAULTS = {
+    # Ticks entre apariciones (aparece algo cuando el contador lo supera)
+    "spawn_interval": 70,
+    # Probabilidad de cada tipo en cada aparición
+    "obstacle_chance": 0.35,
+    "turret_chance": 0.15,
+    "coin_chance": 0.45,
+    "medikit_chance": 0.05,
+    # Torretas y sus balas
+    "turret_cooldown": TURRET_COOLDOWN,
+    "enemy_bullet_speed": ENEMY_BULLET_SPEED,
+    # Daño al helicóptero
+    "obstacle_damage": 20,
+    "enemy_bullet_damage": 10,
+}
+
+
+class Tuning:
+    """Valores de dificultad de una partida; los que no se indican quedan por defecto."""
+    __slots__ = tuple(DEFAULTS)
+
+    def __init__(self, **values):
+        unknown = set(values) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"parámetros desconocidos: {', '.join(sorted(unknown))}")
+        for name, default in DEFAULTS.items():
+            setattr(self, name, values.get(name, default))
+
+    def replace(self, **values):
+        """Copia con algunos valores cambiados."""
+        return Tuning(**{**self.as_dict(), **values})
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in DEFAULTS}
+
+    def changes(self):
+        """Solo los valores distintos de los por defecto."""
+        return {name: value for name, value in self.as_dict().items() if value != DEFAULTS[name]}
+
+    def __repr__(self):
+        changes = ", ".join(f"{name}={value}" for name, value in self.changes().items())
+        return f"Tuning({changes})"